@@ -93,6 +93,19 @@ class RegistrationRoutines:
         """
         return cls.ROUTINES.get(routine_number, "")
     
+    @classmethod
+    def get_routine_messages(cls, routine_numbers: list) -> dict:
+        """
+        Get the routine messages for several routine numbers at once.
+        
+        Args:
+            routine_numbers: The routine step numbers
+            
+        Returns:
+            Dict mapping each routine number to its message, or empty string if not found
+        """
+        return {routine_number: cls.ROUTINES.get(routine_number, "") for routine_number in routine_numbers}
+    
     @classmethod
     def get_available_routines(cls) -> list:
         """Get list of all available routine numbers."""
@@ -53,8 +53,9 @@ def _convert_heic_to_jpeg_for_vision(file_path: str) -> str:
             base_path = os.path.splitext(file_path)[0]
             jpeg_path = f"{base_path}_vision_converted.jpg"
             
-            # Save as JPEG with good quality for Vision API
-            img.save(jpeg_path, 'JPEG', quality=85, optimize=True)
+            # Save as JPEG with good quality for Vision API; this copy is only
+            # read once by the model, so skip the extra Huffman-optimize pass
+            img.save(jpeg_path, 'JPEG', quality=85)
             
             jpeg_size = os.path.getsize(jpeg_path)
             print(f"✅ HEIC converted to JPEG for Vision API: {jpeg_path} ({jpeg_size:,} bytes)")
@@ -465,10 +465,28 @@ async def read_root():
 async def health_check():
     return {"status": "healthy", "message": "UTJFC Registration Backend is running"}
 
+# Upper bound for ?wait= long-polls on /upload-status, in seconds
+MAX_STATUS_WAIT = 30
+
 @app.get("/upload-status/{session_id}")
-async def get_upload_processing_status(session_id: str):
-    """Get the current status of photo upload processing"""
+async def get_upload_processing_status(session_id: str, wait: float = 0):
+    """
+    Get the current status of photo upload processing.
+    
+    With ?wait=N (seconds, up to MAX_STATUS_WAIT) the request is held until the
+    status changes or processing completes, instead of the client re-polling.
+    """
+    if not 0 <= wait <= MAX_STATUS_WAIT:
+        raise HTTPException(status_code=400, detail=f"wait must be between 0 and {MAX_STATUS_WAIT} seconds")
+    
     status = get_upload_status(session_id)
+    deadline = time.monotonic() + wait
+    initial_update = status.get('updated_at')
+    # The store is in-process memory, so re-checking it is cheap and keeps
+    # the wait on the event loop rather than tying up a worker thread
+    while not status.get('complete') and status.get('updated_at') == initial_update and time.monotonic() < deadline:
+        await asyncio.sleep(0.25)
+        status = get_upload_status(session_id)
     return status
 
 @app.post("/upload-async")
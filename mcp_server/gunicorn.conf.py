@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for running the MCP server in production:
+
+    gunicorn server:app -c gunicorn.conf.py
+
+`python server.py` (plain uvicorn) remains the way to run it locally. The
+environment/auth checks and connection pre-warming run in the app's startup
+event, so both entry points get them.
+"""
+
+import os
+
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# SSE streams, async jobs and the query caches all live in the worker that
+# created them, and server.py has no cross-worker routing (the Redis relay
+# exists only in mcp_test_files/server_fixed.py). So run a single worker, and
+# only raise WEB_CONCURRENCY behind a proxy with sticky sessions
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+timeout = 60
+keepalive = 5
+
+# Heartbeat files on tmpfs: a disk-backed tmp dir can stall workers under
+# container runtimes and get them killed as unresponsive
+worker_tmp_dir = "/dev/shm"
@@ -0,0 +1,66 @@
+"""
+Shared pytest fixtures for the MCP test scripts
+"""
+
+import pytest
+import requests
+
+BACKEND_URL = "http://localhost:8000"
+MCP_SERVER_URL = "https://utjfc-mcp-server.replit.app"
+
+# Discovery responses that are effectively static between runs. /health is
+# deliberately not cached: a down server must not look healthy
+CACHEABLE_PATHS = ("/agent/status",)
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-cache",
+        action="store_true",
+        help="Don't serve /agent/status or tools/list from the on-disk response cache"
+    )
+
+def _is_discovery_response(response) -> bool:
+    """Only cache discovery endpoints - tool calls and chat always go to the network"""
+    request = response.request
+    if request.url.endswith(CACHEABLE_PATHS):
+        return True
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    return b'"tools/list"' in body
+
+def pytest_configure(config):
+    if config.getoption("--no-cache"):
+        return
+    try:
+        import requests_cache
+    except ImportError:
+        return  # Optional - runs uncached without requests-cache installed
+    
+    requests_cache.install_cache(
+        "mcp_test_cache",
+        backend="sqlite",
+        expire_after=300,
+        allowable_methods=("GET", "POST"),
+        match_headers=False,
+        filter_fn=_is_discovery_response
+    )
+
+@pytest.fixture(scope="session", autouse=True)
+def mcp_server_available():
+    """Probe the MCP server once and skip the run if it can't be reached"""
+    try:
+        requests.get(f"{MCP_SERVER_URL}/health", timeout=5)
+    except requests.exceptions.RequestException as e:
+        pytest.skip(f"MCP server unavailable: {e}")
+
+@pytest.fixture(scope="session")
+def backend_status():
+    """Fetch /agent/status from the local backend once per run"""
+    try:
+        response = requests.get(f"{BACKEND_URL}/agent/status", timeout=5)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        # Unreachable, timed out or erroring (5xx) all mean "no backend to test"
+        pytest.skip(f"backend down: {e}")
+    return response.json()
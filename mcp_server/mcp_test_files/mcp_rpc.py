@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Shared JSON-RPC helper for the MCP test scripts.
+
+Identical requests (same method + params) made within `ttl` seconds are
+answered from an in-process cache, so scripts that repeat `tools/list` or
+the same read-only Airtable query don't pay another round-trip.
+"""
+
+import hashlib
+import sys
+import time
+
+import orjson
+import requests
+
+MCP_SERVER_URL = "https://utjfc-mcp-server.replit.app"
+
+# Pretty-print responses only when a script is run with -v / --verbose
+VERBOSE = "-v" in sys.argv or "--verbose" in sys.argv
+
+# request hash -> (fetched_at, parsed response)
+_rpc_cache = {}
+_session = requests.Session()
+
+def rpc(method: str, params: dict, ttl: float = 30, timeout: float = 30) -> dict:
+    """POST a JSON-RPC request to the MCP server, memoized by (method, params)"""
+    key = hashlib.blake2b(orjson.dumps([method, params], option=orjson.OPT_SORT_KEYS)).digest()
+    hit = _rpc_cache.get(key)
+    if hit and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+
+    response = _session.post(
+        f"{MCP_SERVER_URL}/mcp",
+        json={
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": method,
+            "params": params
+        },
+        headers={"Content-Type": "application/json"},
+        timeout=timeout
+    )
+    response.raise_for_status()
+    result = orjson.loads(response.content)
+    _rpc_cache[key] = (time.monotonic(), result)
+    return result
+
+def format_json(obj) -> str:
+    """Serialize for display: indented when verbose, compact otherwise"""
+    if VERBOSE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return orjson.dumps(obj).decode()
+
+def clear_rpc_cache():
+    """Drop all memoized responses"""
+    _rpc_cache.clear()
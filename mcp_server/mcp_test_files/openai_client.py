@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Shared OpenAI client for the MCP test scripts.
+
+One client (and so one pooled httpx connection) is reused across every
+test instead of paying a fresh TCP+TLS handshake per OpenAI() instance.
+"""
+
+import atexit
+import os
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+
+load_dotenv()
+
+POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30.0
+)
+TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+_client = None
+
+def get_client() -> OpenAI:
+    """Return the process-wide OpenAI client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.Client(limits=POOL_LIMITS, timeout=TIMEOUT)
+        )
+        atexit.register(_client.close)
+    return _client
+
+def get_async_client() -> AsyncOpenAI:
+    """Return a new pooled AsyncOpenAI client; use it as `async with` inside one event loop"""
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=httpx.AsyncClient(limits=POOL_LIMITS, timeout=TIMEOUT)
+    )
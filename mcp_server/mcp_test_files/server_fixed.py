@@ -6,20 +6,32 @@ This version implements all fixes identified by the OpenAI agent:
 1. Uses correct Mcp-Session-Id header (not X-MCP-Session-Id)
 2. Returns wrapped tools array as per spec
 3. Sends session ID in initialize response
-4. Uses faster polling for immediate message delivery
+4. Delivers queued messages to the SSE stream as soon as they arrive
 """
 
 import os
-import json
+import orjson
 import asyncio
 import logging
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, Response, HTTPException
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from typing import AsyncGenerator, Optional, Dict, Any
+from typing import AsyncGenerator, Optional, Dict
 import uuid
+import re
+import time
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+# Optional: with REDIS_URL set, SSE routing works across uvicorn workers
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
 
 # Load environment variables
 load_dotenv()
@@ -30,9 +42,63 @@ logger = logging.getLogger(__name__)
 
 # Import our Airtable tool
 from tools.airtable.airtable_agent import execute_airtable_request
+from tools.airtable.airtable_setup import get_airtable_client, get_http_client
+
+# Dedicated threads for tool calls, bounded separately from the default
+# executor. execute_airtable_request must stay thread-safe: it shares one
+# AirtableAgent (and its OpenAI/Airtable clients) across these threads
+AIRTABLE_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AIRTABLE_WORKERS", "16")),
+    thread_name_prefix="airtable"
+)
+
+# Identical (season, query) reads within the TTL skip Airtable and the LLM.
+# Only touched from the event loop thread, so it needs no lock
+toolcall_cache = TTLCache(maxsize=1024, ttl=int(os.getenv("TOOLCALL_TTL", "30")))
+# Only queries that are unambiguously reads are cached; anything else may write
+READ_QUERY_PATTERN = re.compile(r"^\s*(how many|list|get|find|show|count)\b", re.IGNORECASE)
+# Bumped by every write so a read that was in flight across it isn't cached
+season_generation: Dict[str, int] = {}
+
+def invalidate_season(season):
+    """Drop every cached tool result for a season after a possible write"""
+    season_generation[season] = season_generation.get(season, 0) + 1
+    for key in [key for key in list(toolcall_cache) if key[0] == season]:
+        toolcall_cache.pop(key, None)
+
+REDIS_URL = os.getenv("REDIS_URL")
+REQUIRED_VARS = ("OPENAI_API_KEY", "AIRTABLE_API_KEY")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Validate config and create shared clients before the app accepts requests"""
+    # Fail fast: a worker without API keys would only fail every tool call
+    missing_vars = [var for var in REQUIRED_VARS if not os.getenv(var)]
+    if missing_vars:
+        raise RuntimeError(f"Missing environment variables: {missing_vars}")
+    # Build the pooled OpenAI/Airtable clients used by execute_airtable_request
+    # now, so the first burst of concurrent tool calls doesn't race to create them
+    app.state.http = get_http_client()
+    app.state.airtable = get_airtable_client()
+    
+    app.state.redis = None
+    if REDIS_URL:
+        if aioredis is None:
+            raise RuntimeError("REDIS_URL is set but the redis package is not installed")
+        app.state.redis = aioredis.from_url(REDIS_URL)
+    
+    janitor = asyncio.create_task(evict_stale_connections())
+    yield
+    janitor.cancel()
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
 
 # Create FastAPI app
-app = FastAPI(title="UTJFC Registration MCP Server")
+app = FastAPI(
+    title="UTJFC Registration MCP Server",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -65,170 +131,299 @@ AIRTABLE_TOOL = {
     }
 }
 
+# tools/list never changes, so its result (and its JSON) is built once
+TOOLS_LIST_RESULT = {"tools": [AIRTABLE_TOOL]}
+TOOLS_LIST_RESULT_JSON = orjson.dumps(TOOLS_LIST_RESULT)
+
+def tools_list_body(jsonrpc: str, request_id) -> bytes:
+    """Serialized tools/list response; only the envelope is encoded per call"""
+    return (
+        b'{"jsonrpc":' + orjson.dumps(jsonrpc)
+        + b',"id":' + orjson.dumps(request_id)
+        + b',"result":' + TOOLS_LIST_RESULT_JSON + b'}'
+    )
+
 # Store active SSE connections
-active_connections: Dict[str, Dict[str, Any]] = {}
+@dataclass(slots=True)
+class Connection:
+    """State for one open SSE stream"""
+    queue: asyncio.Queue
+    created_at: float
+    relay: Optional[asyncio.Task] = None
+    # Set once sse_generator runs; a connection whose stream never started
+    # (client gone before the response began) has nothing to clean it up
+    streaming: bool = False
+
+# Keyed by session id: one SSE stream per session, and a reconnect
+# replaces the previous stream
+active_connections: Dict[str, Connection] = {}
 
-# Map to track which SSE connection belongs to which session
-session_to_connection: Dict[str, str] = {}
+# Bounds so a flooding producer or an abandoned connection can't grow memory forever
+SSE_QUEUE_MAX = int(os.getenv("SSE_QUEUE_MAX", "256"))
+SSE_IDLE_SECONDS = int(os.getenv("SSE_IDLE_SECONDS", "300"))
+
+def enqueue(queue: asyncio.Queue, message):
+    """Queue a message for SSE delivery, dropping the oldest if the queue is full"""
+    if queue.full():
+        queue.get_nowait()
+        logger.warning("SSE queue full; dropped oldest message")
+    queue.put_nowait(message)
+
+def drop_connection(session_id: str, conn: Connection):
+    """Remove a session's connection, stopping any Redis relay"""
+    if conn.relay is not None:
+        conn.relay.cancel()
+    # A reconnect may already have replaced this connection; leave the new one
+    if active_connections.get(session_id) is conn:
+        del active_connections[session_id]
+
+async def evict_stale_connections():
+    """Every 30s, drop connections whose SSE stream never started"""
+    while True:
+        await asyncio.sleep(30)
+        cutoff = time.monotonic() - SSE_IDLE_SECONDS
+        for session_id, conn in list(active_connections.items()):
+            if not conn.streaming and conn.created_at < cutoff:
+                logger.info(f"Evicting stale SSE connection for session {session_id}")
+                drop_connection(session_id, conn)
 
 # Optional authentication
 MCP_AUTH_TOKEN = os.getenv("MCP_AUTH_TOKEN", "")
 
-def check_auth(request: Request) -> bool:
-    """Check if request is authorized"""
-    if not MCP_AUTH_TOKEN:
-        return True  # No auth configured
-    
-    auth_header = request.headers.get("authorization", "")
+def check_auth(auth_header: str, custom_token: str) -> bool:
+    """Check the Authorization / x-mcp-auth-token header values against MCP_AUTH_TOKEN"""
     if auth_header.startswith("Bearer "):
-        token = auth_header[7:]
-        return token == MCP_AUTH_TOKEN
-    
-    custom_token = request.headers.get("x-mcp-auth-token", "")
+        return auth_header[7:] == MCP_AUTH_TOKEN
     return custom_token == MCP_AUTH_TOKEN
 
-async def handle_jsonrpc_request(request_data: dict, request: Request) -> tuple[dict, dict]:
+def is_authorized(headers) -> bool:
+    # Headers are only read when auth is configured
+    return not MCP_AUTH_TOKEN or check_auth(
+        headers.get("authorization", ""),
+        headers.get("x-mcp-auth-token", "")
+    )
+
+def rpc_result(jsonrpc: str, request_id, result) -> dict:
+    return {"jsonrpc": jsonrpc, "id": request_id, "result": result}
+
+def rpc_error(jsonrpc: str, request_id, code: int, message: str) -> dict:
+    return {"jsonrpc": jsonrpc, "id": request_id, "error": {"code": code, "message": message}}
+
+INIT_RESULT = {
+    "protocolVersion": "2025-03-26",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "UTJFC Registration MCP Server",
+        "version": "1.0.0"
+    },
+    # Extension: the tool manifest rides along so clients can skip tools/list.
+    # Spec-conforming clients ignore unknown result fields
+    "tools": TOOLS_LIST_RESULT["tools"]
+}
+
+# MCP liveness check; the result is always an empty object
+PING_RESULT = {}
+
+def ping_body(request_id) -> bytes:
+    """Serialized ping response for the POST fast path"""
+    return b'{"jsonrpc":"2.0","id":' + orjson.dumps(request_id) + b',"result":{}}'
+
+async def handle_ping(jsonrpc: str, request_id, params: dict) -> tuple[dict, dict]:
+    return rpc_result(jsonrpc, request_id, PING_RESULT), {}
+
+async def handle_initialize(jsonrpc: str, request_id, params: dict) -> tuple[dict, dict]:
+    # Generate a session ID for this client and return it in headers
+    session_id = str(uuid.uuid4())
+    logger.debug("Initialize request - assigned session ID: %s", session_id)
+    return rpc_result(jsonrpc, request_id, INIT_RESULT), {"Mcp-Session-Id": session_id}
+
+async def handle_tools_list(jsonrpc: str, request_id, params: dict) -> tuple[dict, dict]:
+    # FIXED: Return wrapped array as per spec
+    return rpc_result(jsonrpc, request_id, TOOLS_LIST_RESULT), {}
+
+async def handle_tools_call(jsonrpc: str, request_id, params: dict) -> tuple[dict, dict]:
+    tool_name = params.get("name")
+    arguments = params.get("arguments", {})
+    
+    if tool_name != "airtable_database_operation":
+        return rpc_error(jsonrpc, request_id, -32602, f"Unknown tool: {tool_name}"), {}
+    
+    season = arguments.get("season")
+    query = arguments.get("query") or ""
+    # Writes must always reach Airtable, never a cached answer
+    is_read = READ_QUERY_PATTERN.match(query) is not None
+    cache_key = (season, query.strip().lower())
+    generation = season_generation.get(season, 0)
+    
+    try:
+        text = toolcall_cache.get(cache_key) if is_read else None
+        if text is None:
+            # Blocking Airtable + LLM round-trip; run it on the bounded
+            # pool so the event loop keeps serving SSE and other requests
+            result = await asyncio.get_running_loop().run_in_executor(
+                AIRTABLE_POOL,
+                execute_airtable_request,
+                season,
+                query
+            )
+            text = orjson.dumps(result).decode()
+            if not is_read:
+                # A write may have changed anything this season's reads returned
+                invalidate_season(season)
+            elif result.get("status") == "success" and season_generation.get(season, 0) == generation:
+                # Errors aren't cached so the next call retries, and neither is
+                # a read that a write to the same season overlapped
+                toolcall_cache[cache_key] = text
+        
+        return rpc_result(jsonrpc, request_id, {
+            "content": [
+                {
+                    "type": "text",
+                    "text": text
+                }
+            ]
+        }), {}
+    except Exception as e:
+        logger.error(f"Tool execution error: {e}")
+        return rpc_error(jsonrpc, request_id, -32603, f"Tool execution failed: {str(e)}"), {}
+
+JSONRPC_METHODS = {
+    "ping": handle_ping,
+    "initialize": handle_initialize,
+    "tools/list": handle_tools_list,
+    "tools/call": handle_tools_call
+}
+
+async def handle_jsonrpc_request(request_data: dict) -> tuple[dict, dict]:
     """Handle JSON-RPC 2.0 requests and return (response, headers)"""
-    jsonrpc = request_data.get("jsonrpc", "2.0")
-    method = request_data.get("method")
-    params = request_data.get("params", {})
     request_id = request_data.get("id")
     
     # If no ID, it's a notification - don't process further
     if request_id is None:
         return None, {}
     
-    try:
-        if method == "initialize":
-            # Generate a session ID for this client
-            session_id = str(uuid.uuid4())
-            
-            response = {
-                "jsonrpc": jsonrpc,
-                "id": request_id,
-                "result": {
-                    "protocolVersion": "2025-03-26",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "serverInfo": {
-                        "name": "UTJFC Registration MCP Server",
-                        "version": "1.0.0"
-                    }
-                }
-            }
-            
-            # Return session ID in headers
-            headers = {"Mcp-Session-Id": session_id}
-            
-            logger.info(f"Initialize request - assigned session ID: {session_id}")
-            
-            return response, headers
-        
-        elif method == "tools/list":
-            # FIXED: Return wrapped array as per spec
-            return {
-                "jsonrpc": jsonrpc,
-                "id": request_id,
-                "result": {
-                    "tools": [AIRTABLE_TOOL]  # Wrapped in object
-                }
-            }, {}
-        
-        elif method == "tools/call":
-            tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-            
-            if tool_name != "airtable_database_operation":
-                return {
-                    "jsonrpc": jsonrpc,
-                    "id": request_id,
-                    "error": {
-                        "code": -32602,
-                        "message": f"Unknown tool: {tool_name}"
-                    }
-                }, {}
-            
-            try:
-                result = execute_airtable_request(
-                    arguments.get("season"),
-                    arguments.get("query")
-                )
-                
-                return {
-                    "jsonrpc": jsonrpc,
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps(result, indent=2)
-                            }
-                        ]
-                    }
-                }, {}
-            except Exception as e:
-                logger.error(f"Tool execution error: {e}")
-                return {
-                    "jsonrpc": jsonrpc,
-                    "id": request_id,
-                    "error": {
-                        "code": -32603,
-                        "message": f"Tool execution failed: {str(e)}"
-                    }
-                }, {}
-        
-        else:
-            return {
-                "jsonrpc": jsonrpc,
-                "id": request_id,
-                "error": {
-                    "code": -32601,
-                    "message": f"Method not found: {method}"
-                }
-            }, {}
+    jsonrpc = request_data.get("jsonrpc", "2.0")
+    method = request_data.get("method")
     
+    handler = JSONRPC_METHODS.get(method)
+    if handler is None:
+        return rpc_error(jsonrpc, request_id, -32601, f"Method not found: {method}"), {}
+    
+    try:
+        return await handler(jsonrpc, request_id, request_data.get("params", {}))
     except Exception as e:
         logger.error(f"Error handling JSON-RPC request: {e}")
-        return {
-            "jsonrpc": jsonrpc,
-            "id": request_id,
-            "error": {
-                "code": -32603,
-                "message": f"Internal error: {str(e)}"
-            }
-        }, {}
+        return rpc_error(jsonrpc, request_id, -32603, f"Internal error: {str(e)}"), {}
+
+# Request/response methods are answered in the POST body (allowed by MCP
+# 2025-03-26) instead of detouring through the SSE stream; the stream is
+# still there for everything else
+INLINE_RESPONSES = os.getenv("MCP_INLINE_RESPONSES", "true").lower() == "true"
+INLINE_METHODS = frozenset({"tools/call", "tools/list", "ping"})
+
+def session_channel(session_id: str) -> str:
+    return f"mcp:session:{session_id}"
+
+async def relay_session_messages(pubsub, queue: asyncio.Queue):
+    """Forward messages published for a session (from any worker) to its SSE queue"""
+    try:
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                enqueue(queue, orjson.loads(message["data"]))
+    finally:
+        await pubsub.aclose()
+
+async def route_to_session(session_id: Optional[str], messages: list) -> bool:
+    """Queue messages on the session's SSE stream; False if no stream is open"""
+    if not session_id:
+        return False
+    
+    # The stream is held by this worker
+    conn = active_connections.get(session_id)
+    if conn is not None:
+        for message in messages:
+            enqueue(conn.queue, message)
+        return True
+    
+    # Another worker may hold it; publish reports how many subscribers got it
+    redis = app.state.redis
+    if redis is not None:
+        channel = session_channel(session_id)
+        delivered = 0
+        for message in messages:
+            delivered = await redis.publish(channel, orjson.dumps(message))
+            if not delivered:
+                break
+        return delivered > 0
+    
+    return False
+
+# Seconds of idle time before an SSE comment is sent to keep proxies from closing the stream
+KEEPALIVE_SECONDS = 15
+
+KEEPALIVE_FRAME = b": keepalive\n\n"
 
-async def sse_generator(connection_id: str) -> AsyncGenerator[str, None]:
+# Messages already queued when one is picked up go out in the same write,
+# up to this many per chunk
+SSE_COALESCE_MAX = int(os.getenv("SSE_COALESCE_MAX", "16"))
+
+def sse_frame(obj) -> bytes:
+    """Encode one SSE data frame straight to bytes"""
+    return b"data: " + orjson.dumps(obj) + b"\n\n"
+
+async def sse_generator(session_id: str, conn: Connection) -> AsyncGenerator[bytes, None]:
     """Generate SSE events for a connection"""
+    get_task = None
+    sleep_task = None
     try:
+        if active_connections.get(session_id) is not conn:
+            return  # Evicted or replaced before the stream started
+        conn.streaming = True
+        
         # Send initial connection event
-        yield f"data: {json.dumps({'type': 'connection', 'status': 'connected', 'connectionId': connection_id})}\n\n"
+        yield sse_frame({'type': 'connection', 'status': 'connected', 'connectionId': session_id})
         
-        # Keep connection alive and send queued messages
-        while connection_id in active_connections:
-            # Check if there are any pending messages for this connection
-            if active_connections[connection_id].get("pending_messages"):
-                message = active_connections[connection_id]["pending_messages"].pop(0)
-                yield f"data: {json.dumps(message)}\n\n"
+        # Wait for a queued message, racing it against a keepalive timer so
+        # delivery is immediate and idle connections don't poll. Each task is
+        # only replaced once it completes, so a keepalive tick leaves the
+        # pending queue.get() in place
+        queue = conn.queue
+        get_task = asyncio.ensure_future(queue.get())
+        sleep_task = asyncio.ensure_future(asyncio.sleep(KEEPALIVE_SECONDS))
+        while active_connections.get(session_id) is conn:
+            done, _ = await asyncio.wait({get_task, sleep_task}, return_when=asyncio.FIRST_COMPLETED)
             
-            # FIXED: Use much shorter sleep for immediate delivery
-            await asyncio.sleep(0.1)  # 100ms polling
+            if get_task in done:
+                frames = [sse_frame(get_task.result())]
+                while len(frames) < SSE_COALESCE_MAX and not queue.empty():
+                    frames.append(sse_frame(queue.get_nowait()))
+                yield b"".join(frames)
+                get_task = asyncio.ensure_future(queue.get())
+            if sleep_task in done:
+                yield KEEPALIVE_FRAME
+                sleep_task = asyncio.ensure_future(asyncio.sleep(KEEPALIVE_SECONDS))
     
     except asyncio.CancelledError:
-        logger.info(f"SSE connection {connection_id} cancelled")
+        logger.info(f"SSE connection for session {session_id} cancelled")
     finally:
+        for task in (get_task, sleep_task):
+            if task is not None:
+                task.cancel()
         # Clean up connection
-        if connection_id in active_connections:
-            session_id = active_connections[connection_id].get("session_id")
-            if session_id and session_id in session_to_connection:
-                del session_to_connection[session_id]
-            del active_connections[connection_id]
+        drop_connection(session_id, conn)
 
-@app.get("/")
-async def root():
-    """Root endpoint - health check"""
-    return JSONResponse({
+# Most 202s carry no headers (only initialize sets Mcp-Session-Id), so
+# those share one prebuilt response
+EMPTY_202 = Response(status_code=202)
+
+def accepted(headers: dict) -> Response:
+    return Response(status_code=202, headers=headers) if headers else EMPTY_202
+
+# Probe responses never change in-process, so serialize them once
+ROOT_RESPONSE = Response(
+    content=orjson.dumps({
         "status": "healthy",
         "server": "UTJFC Registration MCP Server",
         "version": "1.0.0",
@@ -236,49 +431,65 @@ async def root():
             "mcp": "/mcp",
             "health": "/health"
         }
-    })
-
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return JSONResponse({
+    }),
+    media_type="application/json"
+)
+HEALTH_RESPONSE = Response(
+    content=orjson.dumps({
         "status": "healthy",
         "server": "UTJFC Registration MCP Server",
         "version": "1.0.0",
         "transport": "Streamable HTTP",
         "protocol": "MCP 2025-03-26",
         "environment": "production" if os.getenv("REPL_ID") else "development"
-    })
+    }),
+    media_type="application/json"
+)
+
+@app.get("/")
+async def root():
+    """Root endpoint - health check"""
+    return ROOT_RESPONSE
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint"""
+    return HEALTH_RESPONSE
 
 @app.get("/mcp")
 async def mcp_get_endpoint(request: Request):
     """Handle GET requests to MCP endpoint (SSE stream)"""
-    if not check_auth(request):
+    headers = request.headers
+    if not is_authorized(headers):
         raise HTTPException(status_code=401, detail="Unauthorized")
     
-    accept_header = request.headers.get("accept", "")
+    accept_header = headers.get("accept", "")
     
     if "text/event-stream" in accept_header:
-        # Create new SSE connection
-        connection_id = str(uuid.uuid4())
-        
         # FIXED: Check for correct header name (case-insensitive)
-        session_id = request.headers.get("mcp-session-id", connection_id)
+        session_id = headers.get("mcp-session-id") or str(uuid.uuid4())
         
-        active_connections[connection_id] = {
-            "pending_messages": [],
-            "created_at": asyncio.get_event_loop().time(),
-            "session_id": session_id
-        }
+        # Create new SSE connection, replacing any earlier stream for this session
+        previous = active_connections.get(session_id)
+        if previous is not None:
+            drop_connection(session_id, previous)
+        conn = Connection(
+            queue=asyncio.Queue(maxsize=SSE_QUEUE_MAX),
+            created_at=time.monotonic()
+        )
+        active_connections[session_id] = conn
         
-        # Map session to connection for message routing
-        if session_id:
-            session_to_connection[session_id] = connection_id
+        # Subscribe before returning so nothing published for this session is missed
+        redis = request.app.state.redis
+        if redis is not None:
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(session_channel(session_id))
+            conn.relay = asyncio.create_task(relay_session_messages(pubsub, conn.queue))
         
-        logger.info(f"New SSE connection: {connection_id} for session: {session_id}")
+        logger.info(f"New SSE connection for session: {session_id}")
         
         return StreamingResponse(
-            sse_generator(connection_id),
+            sse_generator(session_id, conn),
             media_type="text/event-stream",
             headers={
                 'Cache-Control': 'no-cache',
@@ -293,70 +504,91 @@ async def mcp_get_endpoint(request: Request):
 @app.post("/mcp")
 async def mcp_post_endpoint(request: Request):
     """Handle POST requests to MCP endpoint"""
-    if not check_auth(request):
+    request_headers = request.headers
+    if not is_authorized(request_headers):
         raise HTTPException(status_code=401, detail="Unauthorized")
     
+    # FIXED: Check for correct header name (case-insensitive)
+    session_id = request_headers.get("mcp-session-id")
+    
     try:
-        content_type = request.headers.get("content-type", "")
+        content_type = request_headers.get("content-type", "")
         if "application/json" not in content_type:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "Content-Type must be application/json"},
                 status_code=400
             )
         
-        body = await request.json()
-        
-        # Log request for debugging
-        logger.info(f"MCP Request: {json.dumps(body, indent=2)}")
+        body = orjson.loads(await request.body())
         
-        # FIXED: Check for correct header name (case-insensitive)
-        session_id = request.headers.get("mcp-session-id")
+        # Log request for debugging; formatted only when DEBUG is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("MCP Request: %s", orjson.dumps(body).decode())
         
         # Handle single request or batch
         if isinstance(body, list):
+            # initialize must be sent on its own; everything else in a batch
+            # is independent, so run it concurrently
+            if len(body) > 1 and any(req.get("method") == "initialize" for req in body):
+                return ORJSONResponse(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": None,
+                        "error": {
+                            "code": -32600,
+                            "message": "Invalid Request: initialize must not be batched"
+                        }
+                    },
+                    status_code=400
+                )
+            
+            results = await asyncio.gather(*(handle_jsonrpc_request(req) for req in body))
             responses = []
             response_headers = {}
             
-            for req in body:
-                resp, headers = await handle_jsonrpc_request(req, request)
+            for resp, headers in results:
                 if resp:  # Only add non-None responses
                     responses.append(resp)
-                    response_headers.update(headers)
+                    if headers:
+                        response_headers.update(headers)
             
             # Route responses through SSE if session exists
-            if session_id and session_id in session_to_connection:
-                connection_id = session_to_connection[session_id]
-                if connection_id in active_connections:
-                    # Queue all responses for SSE delivery
-                    for resp in responses:
-                        active_connections[connection_id]["pending_messages"].append(resp)
-                    return Response(status_code=202, headers=response_headers)
+            inline = INLINE_RESPONSES and all(req.get("method") in INLINE_METHODS for req in body)
+            if not inline and await route_to_session(session_id, responses):
+                return accepted(response_headers)
             
             # No SSE session, return responses directly
-            return JSONResponse(responses, headers=response_headers)
+            return ORJSONResponse(responses, headers=response_headers)
         
         else:
             # Single request
-            response, headers = await handle_jsonrpc_request(body, request)
+            if body.get("method") == "ping" and body.get("id") is not None:
+                # Liveness checks skip dispatch (and session routing) entirely
+                return Response(content=ping_body(body["id"]), media_type="application/json")
+            
+            response, headers = await handle_jsonrpc_request(body)
             
             # If it's a notification (no response), return 202
             if response is None:
-                return Response(status_code=202)
+                return EMPTY_202
             
             # Route response through SSE if session exists
-            if session_id and session_id in session_to_connection:
-                connection_id = session_to_connection[session_id]
-                if connection_id in active_connections:
-                    # Queue response for SSE delivery
-                    active_connections[connection_id]["pending_messages"].append(response)
-                    logger.info(f"Queued response for SSE delivery to session {session_id}")
-                    return Response(status_code=202, headers=headers)
+            inline = INLINE_RESPONSES and body.get("method") in INLINE_METHODS
+            if not inline and await route_to_session(session_id, [response]):
+                logger.debug("Queued response for SSE delivery to session %s", session_id)
+                return accepted(headers)
             
             # No SSE session, return response directly
-            return JSONResponse(response, headers=headers)
+            if body.get("method") == "tools/list":
+                return Response(
+                    content=tools_list_body(response["jsonrpc"], response["id"]),
+                    media_type="application/json",
+                    headers=headers
+                )
+            return ORJSONResponse(response, headers=headers)
     
-    except json.JSONDecodeError:
-        return JSONResponse(
+    except orjson.JSONDecodeError:
+        return ORJSONResponse(
             {
                 "jsonrpc": "2.0",
                 "error": {
@@ -368,7 +600,7 @@ async def mcp_post_endpoint(request: Request):
         )
     except Exception as e:
         logger.error(f"Error handling POST request: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "jsonrpc": "2.0",
                 "error": {
@@ -401,17 +633,16 @@ if __name__ == "__main__":
     print(f"🛠️  Tools available: airtable_database_operation")
     print(f"🌐 Streamable HTTP Transport with SSE Response Routing")
     print(f"📋 Protocol: MCP 2025-03-26")
-    print(f"✨ Fixes: Correct headers, wrapped tools, fast polling")
+    print(f"✨ Fixes: Correct headers, wrapped tools, event-driven SSE delivery")
     
     if os.getenv("REPL_ID"):
         print(f"🔧 Running on Replit")
     
-    required_vars = ["OPENAI_API_KEY", "AIRTABLE_API_KEY"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = [var for var in REQUIRED_VARS if not os.getenv(var)]
     
     if missing_vars:
         print(f"⚠️  Missing environment variables: {missing_vars}")
-        print(f"📝 Please set them in Replit Secrets")
+        print(f"📝 Please set them in Replit Secrets - the server will refuse to start without them")
     else:
         print(f"✅ Environment variables configured")
     
@@ -424,4 +655,24 @@ if __name__ == "__main__":
     print(f"🔗 MCP endpoint: /mcp")
     print(f"❤️  Health check: /health")
     
-    uvicorn.run("server:app", host=host, port=port, log_level="info", reload=False) 
\ No newline at end of file
+    # uvloop + httptools come with uvicorn[standard]; fall back to asyncio/h11
+    # where uvloop isn't available (e.g. Windows)
+    try:
+        import uvloop
+        uvloop.install()
+        loop_impl, http_impl = "uvloop", "httptools"
+    except ImportError:
+        loop_impl, http_impl = "asyncio", "auto"
+    
+    uvicorn.run(
+        "server:app",
+        host=host,
+        port=port,
+        log_level="info",
+        reload=False,
+        loop=loop_impl,
+        http=http_impl,
+        # SSE streams are per-process; only run more than one worker with
+        # REDIS_URL set so POSTs can reach a stream held by another worker
+        workers=int(os.getenv("WEB_CONCURRENCY", 1))
+    ) 
\ No newline at end of file
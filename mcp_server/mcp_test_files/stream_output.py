@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Console helpers for the streaming MCP test scripts.
+
+Providers sometimes buffer and then dump one huge chunk, or trickle out
+1-2 characters at a time. ChunkSmoother evens that out so streamed text
+renders steadily instead of in jumps or flickers.
+"""
+
+import sys
+
+class ChunkSmoother:
+    """Coalesce tiny stream chunks and split oversized ones before printing"""
+
+    def __init__(self, min_size=16, split_above=50, slice_size=None):
+        self.min_size = min_size
+        self.split_above = split_above
+        # Slices can't be longer than the split threshold, or chunks just
+        # above it would pass the check without ever being cut
+        self.slice_size = min(slice_size or split_above, split_above)
+        self._buf = ""
+
+    def feed(self, s):
+        """Add a chunk; yield whatever is ready to print"""
+        self._buf += s
+        if len(self._buf) < self.min_size:
+            return
+        buf, self._buf = self._buf, ""
+        if len(buf) > self.split_above:
+            while len(buf) >= self.slice_size:
+                yield buf[:self.slice_size]
+                buf = buf[self.slice_size:]
+            if len(buf) < self.min_size:
+                # Too short to print alone; carry it into the next chunk
+                self._buf = buf
+                return
+        yield buf
+
+    def flush(self):
+        """Yield anything still buffered at the end of a stream"""
+        if self._buf:
+            buf, self._buf = self._buf, ""
+            yield buf
+
+def write_smoothed(pieces):
+    """Print smoother output as it becomes available"""
+    for piece in pieces:
+        sys.stdout.write(piece)
+        sys.stdout.flush()
@@ -2,14 +2,24 @@
 """Test the deployed MCP server's SSE routing behavior"""
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import threading
 import time
 import queue
+import pytest
 
 # Server URL
 SERVER_URL = "https://utjfc-mcp-server.replit.app"
 
+# One keep-alive session so the SSE stream and the POSTs reuse connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.1)))
+
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
 def sse_listener(session_id, message_queue):
     """Listen to SSE stream"""
     print(f"🎧 Starting SSE listener for session {session_id}")
@@ -20,7 +30,7 @@ def sse_listener(session_id, message_queue):
     }
     
     try:
-        response = requests.get(f"{SERVER_URL}/mcp", headers=headers, stream=True)
+        response = SESSION.get(f"{SERVER_URL}/mcp", headers=headers, stream=True)
         print(f"📡 SSE connection established: {response.status_code}")
         
         for line in response.iter_lines():
@@ -65,10 +75,18 @@ def test_sse_routing():
         "id": 1
     }
     
-    response = requests.post(f"{SERVER_URL}/mcp", json=request_data, headers=headers)
+    response = SESSION.post(f"{SERVER_URL}/mcp", json=request_data, headers=headers)
     print(f"📥 POST Response: {response.status_code}")
     
-    if response.status_code == 202:
+    # Servers with MCP_INLINE_RESPONSES answer in the POST body (200);
+    # otherwise a 202 means the response is routed through SSE
+    if response.status_code == 200 and response.text:
+        data = response.json()
+        if data.get("id") == 1 and "result" in data:
+            print(f"✅ Got 200 - tools/list answered inline: {json.dumps(data, indent=2)}")
+        else:
+            print(f"❌ Unexpected inline response: {data}")
+    elif response.status_code == 202:
         print("✅ Got 202 - Response should be routed through SSE")
         
         # Wait for SSE message
@@ -78,7 +96,7 @@ def test_sse_routing():
         except queue.Empty:
             print("❌ No SSE message received within 5 seconds")
     else:
-        print(f"❌ Expected 202, got {response.status_code}")
+        print(f"❌ Expected 200 with a result or 202, got {response.status_code}")
         if response.text:
             print(f"Response body: {response.text}")
     
@@ -102,7 +120,7 @@ def test_sse_routing():
         "id": 2
     }
     
-    response = requests.post(f"{SERVER_URL}/mcp", json=request_data, headers=headers)
+    response = SESSION.post(f"{SERVER_URL}/mcp", json=request_data, headers=headers)
     print(f"📥 Initialize Response: {response.status_code}")
     
     # Check for session ID in response headers
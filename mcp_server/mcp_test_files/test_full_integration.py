@@ -7,6 +7,8 @@ import requests
 import json
 import os
 from dotenv import load_dotenv
+import pytest
+from mcp_rpc import rpc
 
 # Load environment variables
 load_dotenv()
@@ -15,6 +17,9 @@ load_dotenv()
 BACKEND_URL = "http://localhost:8000"
 MCP_SERVER_URL = "https://utjfc-mcp-server.replit.app"
 
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
 def test_backend_status():
     """Test backend agent status"""
     print("\n1️⃣ Testing Backend Agent Status...")
@@ -57,31 +62,20 @@ def test_mcp_tools():
     """Test MCP server tools list"""
     print("\n3️⃣ Testing MCP Server Tools...")
     try:
-        response = requests.post(
-            f"{MCP_SERVER_URL}/mcp",
-            headers={"Content-Type": "application/json"},
-            json={
-                "jsonrpc": "2.0",
-                "method": "tools/list",
-                "params": {},
-                "id": 1
-            }
-        )
-        if response.status_code == 200:
-            data = response.json()
-            tools = data.get("result", {}).get("tools", [])
-            print(f"✅ MCP Server has {len(tools)} tools:")
-            for tool in tools:
-                print(f"   - {tool['name']}: {tool['description'][:60]}...")
-            return True
-        else:
-            print(f"❌ MCP tools list failed: {response.status_code}")
-            return False
+        data = rpc("tools/list", {})
+        tools = data.get("result", {}).get("tools", [])
+        print(f"✅ MCP Server has {len(tools)} tools:")
+        for tool in tools:
+            print(f"   - {tool['name']}: {tool['description'][:60]}...")
+        return True
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ MCP tools list failed: {e.response.status_code}")
+        return False
     except Exception as e:
         print(f"❌ Error listing MCP tools: {e}")
         return False
 
-def test_backend_chat():
+def test_backend_chat(backend_status):
     """Test backend chat with MCP integration"""
     print("\n4️⃣ Testing Backend Chat with MCP...")
     
@@ -112,7 +106,7 @@ def test_backend_chat():
         print(f"❌ Error in backend chat: {e}")
         return False
 
-def test_airtable_query():
+def test_airtable_query(backend_status):
     """Test a real Airtable query through the full stack"""
     print("\n5️⃣ Testing Real Airtable Query...")
     
@@ -151,22 +145,21 @@ def main():
     print(f"   MCP_SERVER_URL: {os.getenv('MCP_SERVER_URL', 'Not set (will use default)')}")
     print(f"   USE_MCP: {os.getenv('USE_MCP', 'Not set (defaults to true)')}")
     
-    # Run tests
+    # Run tests - the backend is probed once and the result shared below
     backend_status = test_backend_status()
     if not backend_status:
         print("\n⚠️  Backend is not running. Please start it with:")
         print("   cd backend && python server.py")
-        return
-    
-    # Check if backend is using correct MCP server URL
-    mcp_url = backend_status['current_agent'].get('mcp_server_url', '')
-    if 'localhost' in mcp_url or '8002' in mcp_url:
-        print("\n⚠️  Backend is using local MCP server URL!")
-        print(f"   Current: {mcp_url}")
-        print(f"   Should be: {MCP_SERVER_URL}/mcp")
-        print("\n   To fix, set environment variable:")
-        print(f"   export MCP_SERVER_URL={MCP_SERVER_URL}/mcp")
-        print("   Then restart the backend server")
+    else:
+        # Check if backend is using correct MCP server URL
+        mcp_url = backend_status['current_agent'].get('mcp_server_url', '')
+        if 'localhost' in mcp_url or '8002' in mcp_url:
+            print("\n⚠️  Backend is using local MCP server URL!")
+            print(f"   Current: {mcp_url}")
+            print(f"   Should be: {MCP_SERVER_URL}/mcp")
+            print("\n   To fix, set environment variable:")
+            print(f"   export MCP_SERVER_URL={MCP_SERVER_URL}/mcp")
+            print("   Then restart the backend server")
     
     # Continue with other tests
     mcp_healthy = test_mcp_server_health()
@@ -175,8 +168,8 @@ def main():
     
     # Test full integration
     if backend_status and mcp_healthy:
-        test_backend_chat()
-        test_airtable_query()
+        test_backend_chat(backend_status)
+        test_airtable_query(backend_status)
     
     print("\n✨ Integration test complete!")
 
@@ -3,57 +3,47 @@
 Debug test to understand Airtable integration failures
 """
 
-import requests
-import json
+import logging
+import orjson
 import time
+import pytest
+from mcp_rpc import rpc, format_json, VERBOSE
 
 # MCP Server URL
 MCP_SERVER_URL = "https://utjfc-mcp-server.replit.app"
 
+logger = logging.getLogger(__name__)
+
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
 def test_simple_query():
     """Test with the simplest possible query"""
     print("\n" + "="*60)
     print("🧪 TEST: Simplest Query")
     print("="*60)
     
-    request_data = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": "airtable_database_operation",
-            "arguments": {
-                "season": "2526",
-                "query": "count"  # Simplest possible query
-            }
+    params = {
+        "name": "airtable_database_operation",
+        "arguments": {
+            "season": "2526",
+            "query": "count"  # Simplest possible query
         }
     }
     
     try:
         print("📤 Sending minimal query...")
-        response = requests.post(
-            f"{MCP_SERVER_URL}/mcp",
-            json=request_data,
-            headers={"Content-Type": "application/json"},
-            timeout=60  # Longer timeout
-        )
-        
-        print(f"📥 Response Status: {response.status_code}")
+        result = rpc("tools/call", params, timeout=60)  # Longer timeout
+        logger.debug("response: %s", result)
         
-        if response.status_code == 200:
-            result = response.json()
-            print(f"Full response: {json.dumps(result, indent=2)}")
-            
-            # Try to extract error details
-            if "result" in result and "content" in result["result"]:
-                content = result["result"]["content"][0]["text"]
-                parsed = json.loads(content)
-                if parsed.get("status") == "error":
-                    print(f"\n❌ Error Details: {parsed.get('message')}")
-                    if "data" in parsed and parsed["data"]:
-                        print(f"Additional info: {parsed['data']}")
-        else:
-            print(f"HTTP Error: {response.text}")
+        # Try to extract error details
+        if "result" in result and "content" in result["result"]:
+            content = result["result"]["content"][0]["text"]
+            parsed = orjson.loads(content)
+            if parsed.get("status") == "error":
+                print(f"\n❌ Error Details: {parsed.get('message')}")
+                if "data" in parsed and parsed["data"]:
+                    print(f"Additional info: {parsed['data']}")
             
     except Exception as e:
         print(f"Exception: {type(e).__name__}: {e}")
@@ -65,50 +55,35 @@ def test_with_different_model():
     print("="*60)
     
     # First, let's see if we can get more details about the error
-    request_data = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": "airtable_database_operation",
-            "arguments": {
-                "season": "2526",
-                "query": "Show all records"  # Different query format
-            }
+    params = {
+        "name": "airtable_database_operation",
+        "arguments": {
+            "season": "2526",
+            "query": "Show all records"  # Different query format
         }
     }
     
     try:
         print("📤 Testing with 'Show all records' query...")
-        response = requests.post(
-            f"{MCP_SERVER_URL}/mcp",
-            json=request_data,
-            headers={"Content-Type": "application/json"},
-            timeout=60
-        )
+        result = rpc("tools/call", params, timeout=60)
         
-        print(f"📥 Response Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            
-            # Check if there's an error in the response
-            if "error" in result:
-                print(f"JSON-RPC Error: {result['error']}")
-            elif "result" in result:
-                # Try to parse the nested response
-                try:
-                    content = result["result"]["content"][0]["text"]
-                    parsed = json.loads(content)
-                    print(f"Status: {parsed.get('status')}")
-                    print(f"Message: {parsed.get('message')}")
-                    
-                    # Look for any clues in the data
-                    if "data" in parsed:
-                        print(f"Data: {json.dumps(parsed['data'], indent=2)}")
-                except Exception as parse_error:
-                    print(f"Parse error: {parse_error}")
-                    print(f"Raw result: {json.dumps(result, indent=2)}")
+        # Check if there's an error in the response
+        if "error" in result:
+            print(f"JSON-RPC Error: {result['error']}")
+        elif "result" in result:
+            # Try to parse the nested response
+            try:
+                content = result["result"]["content"][0]["text"]
+                parsed = orjson.loads(content)
+                print(f"Status: {parsed.get('status')}")
+                print(f"Message: {parsed.get('message')}")
+                
+                # Look for any clues in the data
+                if "data" in parsed:
+                    logger.debug("data: %s", parsed['data'])
+            except Exception as parse_error:
+                print(f"Parse error: {parse_error}")
+                print(f"Raw result: {format_json(result)}")
                     
     except Exception as e:
         print(f"Exception: {type(e).__name__}: {e}")
@@ -120,34 +95,21 @@ def test_direct_airtable_check():
     print("="*60)
     
     # Try a very specific query that should work if Airtable is accessible
-    request_data = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": "airtable_database_operation",
-            "arguments": {
-                "season": "2526",
-                "query": "List first record"  # Very specific, simple operation
-            }
+    params = {
+        "name": "airtable_database_operation",
+        "arguments": {
+            "season": "2526",
+            "query": "List first record"  # Very specific, simple operation
         }
     }
     
     try:
         print("📤 Testing with 'List first record' query...")
-        response = requests.post(
-            f"{MCP_SERVER_URL}/mcp",
-            json=request_data,
-            headers={"Content-Type": "application/json"},
-            timeout=60
-        )
-        
-        print(f"📥 Response Status: {response.status_code}")
-        result = response.json()
+        result = rpc("tools/call", params, timeout=60)
         
         # Full response for debugging
-        print(f"\nFull response structure:")
-        print(json.dumps(result, indent=2))
+        print(f"✅ Status: {'error' if 'error' in result else 'ok'}")
+        logger.debug("response: %s", result)
         
     except Exception as e:
         print(f"Exception: {type(e).__name__}: {e}")
@@ -176,4 +138,5 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if VERBOSE else logging.INFO)
     main() 
\ No newline at end of file
@@ -3,25 +3,34 @@
 Test script to verify Airtable integration through the deployed MCP server
 """
 
+import logging
 import requests
-import json
-import time
+import orjson
+import pytest
+from mcp_rpc import format_json, VERBOSE
 
 # MCP Server URL
 MCP_SERVER_URL = "https://utjfc-mcp-server.replit.app"
 
-def test_mcp_tool_call(season: str, query: str, test_name: str):
-    """Make a tool call to the MCP server and display results"""
-    print(f"\n{'='*60}")
-    print(f"🧪 TEST: {test_name}")
-    print(f"📋 Season: {season}")
-    print(f"📝 Query: {query}")
-    print(f"{'='*60}")
-    
-    # Prepare the JSON-RPC request
-    request_data = {
+logger = logging.getLogger(__name__)
+
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
+# (query, test name) pairs sent together as one JSON-RPC batch
+QUERIES = [
+    ("Count all registrations", "Count All Registrations"),
+    ("Find Stefan Hayton", "Find Specific Player"),
+    ("Show all players in age group u10", "Find Players by Age Group"),
+    ("Find all players with medical issues", "Find Players with Medical Issues"),
+    ("Show all Tigers team players", "Find Players by Team"),
+]
+
+def make_request(request_id: int, season: str, query: str) -> dict:
+    """Build a JSON-RPC tools/call request for the Airtable tool"""
+    return {
         "jsonrpc": "2.0",
-        "id": 1,
+        "id": request_id,
         "method": "tools/call",
         "params": {
             "name": "airtable_database_operation",
@@ -31,13 +40,85 @@ def test_mcp_tool_call(season: str, query: str, test_name: str):
             }
         }
     }
+
+def print_test_header(season: str, query: str, test_name: str):
+    """Print the banner for a single query"""
+    print(f"\n{'='*60}")
+    print(f"🧪 TEST: {test_name}")
+    print(f"📋 Season: {season}")
+    print(f"📝 Query: {query}")
+    print(f"{'='*60}")
+
+def display_tool_result(result: dict) -> bool:
+    """Display a single JSON-RPC tools/call response"""
+    # Check for error in response
+    if "error" in result:
+        print(f"❌ Error: {result['error']}")
+        return False
+
+    # Extract the actual result
+    if "result" in result and "content" in result["result"]:
+        content = result["result"]["content"][0]["text"]
+        parsed_content = orjson.loads(content)
+
+        print(f"\n✅ Status: {parsed_content.get('status', 'unknown')}")
+        print(f"📨 Message: {parsed_content.get('message', 'No message')}")
+
+        # Display the data
+        if "data" in parsed_content and parsed_content["data"]:
+            data = parsed_content["data"]
+
+            # Show operation plan
+            if "operation_plan" in data:
+                op_plan = data["operation_plan"]
+                print(f"\n🔧 Operation Plan:")
+                print(f"   Type: {op_plan.get('operation_type')}")
+                print(f"   Method: {op_plan.get('method')}")
+                print(f"   Explanation: {op_plan.get('explanation')}")
+
+            # Show results
+            if "result" in data:
+                result_data = data["result"]
+
+                # Handle different result types
+                if isinstance(result_data, dict):
+                    if "count" in result_data:
+                        print(f"\n📊 Count: {result_data['count']}")
+                    elif "error" in result_data:
+                        print(f"\n❌ Operation Error: {result_data['error']}")
+                    else:
+                        logger.debug("result: %s", result_data)
+                elif isinstance(result_data, list):
+                    print(f"\n📊 Found {len(result_data)} records")
+                    # Show first few records
+                    for i, record in enumerate(result_data[:3]):
+                        if "fields" in record:
+                            fields = record["fields"]
+                            print(f"\n   Record {i+1}:")
+                            print(f"   - Player: {fields.get('player_first_name', '')} {fields.get('player_last_name', '')}")
+                            print(f"   - Age Group: {fields.get('age_group', 'N/A')}")
+                            print(f"   - Team: {fields.get('team', 'N/A')}")
+                    if len(result_data) > 3:
+                        print(f"\n   ... and {len(result_data) - 3} more records")
+                else:
+                    print(f"\n📄 Result: {result_data}")
+
+        return True
+    else:
+        print("❌ Unexpected response format")
+        print(f"Full response: {format_json(result)}")
+        return False
+
+def test_mcp_tool_call(season: str, query: str, test_name: str):
+    """Make a tool call to the MCP server and display results"""
+    print_test_header(season, query, test_name)
     
     try:
         # Make the request
         print("📤 Sending request to MCP server...")
         response = requests.post(
             f"{MCP_SERVER_URL}/mcp",
-            json=request_data,
+            json=make_request(1, season, query),
             headers={"Content-Type": "application/json"},
             timeout=30
         )
@@ -45,65 +126,7 @@ def test_mcp_tool_call(season: str, query: str, test_name: str):
         print(f"📥 Response Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
-            
-            # Check for error in response
-            if "error" in result:
-                print(f"❌ Error: {result['error']}")
-                return False
-            
-            # Extract the actual result
-            if "result" in result and "content" in result["result"]:
-                content = result["result"]["content"][0]["text"]
-                parsed_content = json.loads(content)
-                
-                print(f"\n✅ Status: {parsed_content.get('status', 'unknown')}")
-                print(f"📨 Message: {parsed_content.get('message', 'No message')}")
-                
-                # Display the data
-                if "data" in parsed_content and parsed_content["data"]:
-                    data = parsed_content["data"]
-                    
-                    # Show operation plan
-                    if "operation_plan" in data:
-                        op_plan = data["operation_plan"]
-                        print(f"\n🔧 Operation Plan:")
-                        print(f"   Type: {op_plan.get('operation_type')}")
-                        print(f"   Method: {op_plan.get('method')}")
-                        print(f"   Explanation: {op_plan.get('explanation')}")
-                    
-                    # Show results
-                    if "result" in data:
-                        result_data = data["result"]
-                        
-                        # Handle different result types
-                        if isinstance(result_data, dict):
-                            if "count" in result_data:
-                                print(f"\n📊 Count: {result_data['count']}")
-                            elif "error" in result_data:
-                                print(f"\n❌ Operation Error: {result_data['error']}")
-                            else:
-                                print(f"\n📄 Result: {json.dumps(result_data, indent=2)}")
-                        elif isinstance(result_data, list):
-                            print(f"\n📊 Found {len(result_data)} records")
-                            # Show first few records
-                            for i, record in enumerate(result_data[:3]):
-                                if "fields" in record:
-                                    fields = record["fields"]
-                                    print(f"\n   Record {i+1}:")
-                                    print(f"   - Player: {fields.get('player_first_name', '')} {fields.get('player_last_name', '')}")
-                                    print(f"   - Age Group: {fields.get('age_group', 'N/A')}")
-                                    print(f"   - Team: {fields.get('team', 'N/A')}")
-                            if len(result_data) > 3:
-                                print(f"\n   ... and {len(result_data) - 3} more records")
-                        else:
-                            print(f"\n📄 Result: {result_data}")
-                
-                return True
-            else:
-                print("❌ Unexpected response format")
-                print(f"Full response: {json.dumps(result, indent=2)}")
-                return False
+            return display_tool_result(response.json())
         else:
             print(f"❌ HTTP Error: {response.status_code}")
             print(f"Response: {response.text}")
@@ -116,58 +139,50 @@ def test_mcp_tool_call(season: str, query: str, test_name: str):
         print(f"❌ Exception: {type(e).__name__}: {e}")
         return False
 
+def run_batch(season: str, queries: list) -> dict:
+    """Send all queries as one JSON-RPC batch and return responses keyed by id"""
+    batch = [make_request(i, season, query) for i, (query, _) in enumerate(queries, start=1)]
+    
+    print(f"📤 Sending batch of {len(batch)} requests to MCP server...")
+    response = requests.post(
+        f"{MCP_SERVER_URL}/mcp",
+        json=batch,
+        headers={"Content-Type": "application/json"},
+        timeout=30 * len(batch)
+    )
+    print(f"📥 Response Status: {response.status_code}")
+    response.raise_for_status()
+    
+    return {resp.get("id"): resp for resp in response.json()}
+
 def main():
     """Run all tests"""
     print("🚀 Testing MCP Server Airtable Integration")
     print(f"🔗 Server: {MCP_SERVER_URL}")
     print("=" * 60)
     
-    # Test 1: Count all registrations
-    test_mcp_tool_call(
-        season="2526",
-        query="Count all registrations",
-        test_name="Count All Registrations"
-    )
-    
-    time.sleep(1)  # Small delay between requests
-    
-    # Test 2: Find specific player
-    test_mcp_tool_call(
-        season="2526",
-        query="Find Stefan Hayton",
-        test_name="Find Specific Player"
-    )
-    
-    time.sleep(1)
-    
-    # Test 3: Find players by age group
-    test_mcp_tool_call(
-        season="2526",
-        query="Show all players in age group u10",
-        test_name="Find Players by Age Group"
-    )
-    
-    time.sleep(1)
-    
-    # Test 4: Find players with medical issues
-    test_mcp_tool_call(
-        season="2526",
-        query="Find all players with medical issues",
-        test_name="Find Players with Medical Issues"
-    )
-    
-    time.sleep(1)
+    season = "2526"
+    try:
+        responses = run_batch(season, QUERIES)
+    except Exception as e:
+        print(f"❌ Batch request failed: {type(e).__name__}: {e}")
+        return
     
-    # Test 5: Find players by team
-    test_mcp_tool_call(
-        season="2526",
-        query="Show all Tigers team players",
-        test_name="Find Players by Team"
-    )
+    for request_id, (query, test_name) in enumerate(QUERIES, start=1):
+        print_test_header(season, query, test_name)
+        result = responses.get(request_id)
+        if result is None:
+            print(f"❌ No response for request id {request_id}")
+            continue
+        try:
+            display_tool_result(result)
+        except Exception as e:
+            print(f"❌ Exception: {type(e).__name__}: {e}")
     
     print("\n" + "=" * 60)
     print("✅ All tests completed!")
     print("=" * 60)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if VERBOSE else logging.INFO)
     main() 
\ No newline at end of file
@@ -3,11 +3,18 @@
 Basic test to check MCP server functionality
 """
 
+import logging
 import requests
-import json
+import pytest
+from mcp_rpc import rpc, format_json, VERBOSE
 
 MCP_SERVER_URL = "https://utjfc-mcp-server.replit.app"
 
+logger = logging.getLogger(__name__)
+
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
 def test_health():
     """Test health endpoint"""
     print("🏥 Testing Health Endpoint...")
@@ -15,7 +22,7 @@ def test_health():
         response = requests.get(f"{MCP_SERVER_URL}/health")
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            print(f"Response: {json.dumps(response.json(), indent=2)}")
+            print(f"Response: {format_json(response.json())}")
         else:
             print(f"Error: {response.text}")
     except Exception as e:
@@ -24,25 +31,12 @@ def test_health():
 def test_tools_list():
     """Test tools/list method"""
     print("\n🔧 Testing Tools List...")
-    request_data = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/list",
-        "params": {}
-    }
     
     try:
-        response = requests.post(
-            f"{MCP_SERVER_URL}/mcp",
-            json=request_data,
-            headers={"Content-Type": "application/json"}
-        )
-        print(f"Status: {response.status_code}")
-        if response.status_code == 200:
-            result = response.json()
-            print(f"Response: {json.dumps(result, indent=2)}")
-        else:
-            print(f"Error: {response.text}")
+        result = rpc("tools/list", {})
+        tools = result.get("result", {}).get("tools", [])
+        print(f"✅ Status: {len(tools)} tools listed")
+        logger.debug("tools/list response: %s", result)
     except Exception as e:
         print(f"Exception: {e}")
 
@@ -66,13 +60,14 @@ def test_initialize():
         print(f"Headers: {dict(response.headers)}")
         if response.status_code == 200:
             result = response.json()
-            print(f"Response: {json.dumps(result, indent=2)}")
+            print(f"Response: {format_json(result)}")
         else:
             print(f"Error: {response.text}")
     except Exception as e:
         print(f"Exception: {e}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if VERBOSE else logging.INFO)
     print(f"🔍 Testing MCP Server: {MCP_SERVER_URL}")
     print("=" * 60)
     
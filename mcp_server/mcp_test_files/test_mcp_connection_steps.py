@@ -3,12 +3,20 @@
 Step-by-step test of MCP server connections
 """
 
+import logging
 import requests
-import json
+import orjson
 import time
+import pytest
+from mcp_rpc import rpc, format_json, VERBOSE
 
 MCP_SERVER_URL = "https://utjfc-mcp-server.replit.app"
 
+logger = logging.getLogger(__name__)
+
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
 def test_step(step_name, request_data):
     """Execute a test step and display results"""
     print(f"\n{'='*60}")
@@ -17,7 +25,7 @@ def test_step(step_name, request_data):
     
     try:
         print("📤 Sending request...")
-        print(f"Request: {json.dumps(request_data['params']['arguments'], indent=2)}")
+        print(f"Request: {format_json(request_data['params']['arguments'])}")
         
         response = requests.post(
             f"{MCP_SERVER_URL}/mcp",
@@ -37,13 +45,13 @@ def test_step(step_name, request_data):
             
             if "result" in result and "content" in result["result"]:
                 content = result["result"]["content"][0]["text"]
-                parsed = json.loads(content)
-                print(f"\n✅ Result:")
-                print(json.dumps(parsed, indent=2))
+                parsed = orjson.loads(content)
+                print(f"\n✅ Status: {parsed.get('status', 'unknown')}")
+                logger.debug("response: %s", parsed)
                 return True
             else:
                 print("❌ Unexpected response format")
-                print(json.dumps(result, indent=2))
+                print(format_json(result))
                 return False
         else:
             print(f"❌ HTTP Error: {response.text}")
@@ -101,25 +109,16 @@ def main():
     print("🔧 Step 3: List Available Tools")
     print("=" * 60)
     
-    response = requests.post(
-        f"{MCP_SERVER_URL}/mcp",
-        json={
-            "jsonrpc": "2.0",
-            "id": 3,
-            "method": "tools/list",
-            "params": {}
-        },
-        headers={"Content-Type": "application/json"}
-    )
-    
-    if response.status_code == 200:
-        result = response.json()
+    try:
+        result = rpc("tools/list", {})
         if "result" in result and "tools" in result["result"]:
             print("✅ Available tools:")
             for tool in result["result"]["tools"]:
                 print(f"   - {tool['name']}: {tool['description'][:60]}...")
         else:
             print("❌ Could not list tools")
+    except Exception as e:
+        print(f"❌ Exception: {type(e).__name__}: {e}")
     
     print("\n" + "=" * 60)
     print("📊 Test Summary:")
@@ -130,4 +129,5 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if VERBOSE else logging.INFO)
     main() 
\ No newline at end of file
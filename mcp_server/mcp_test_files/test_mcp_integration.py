@@ -8,7 +8,8 @@ import requests
 import json
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai_client import get_client
+import pytest
 
 # Load environment variables
 load_dotenv()
@@ -19,6 +20,9 @@ MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "https://utjfc-mcp-server.replit.ap
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MCP_AUTH_TOKEN = os.getenv("MCP_AUTH_TOKEN")
 
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
 def test_mcp_server_health():
     """Test if MCP server is running and healthy"""
     print("🔍 Testing MCP Server Health...")
@@ -154,7 +158,7 @@ def test_openai_mcp_integration():
         print("❌ OPENAI_API_KEY not set")
         return
     
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    client = get_client()
     
     try:
         print("📤 Sending request to OpenAI with MCP tool...")
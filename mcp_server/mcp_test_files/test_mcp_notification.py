@@ -4,9 +4,18 @@ Test MCP server's handling of notifications (requests without ID)
 """
 
 import requests
-import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from mcp_rpc import format_json
 
 MCP_SERVER_URL = "https://utjfc-mcp-server.replit.app"
+# The server only writes a keepalive every 30s, so a per-read timeout must be
+# longer than that; the whole SSE read is bounded separately by wall clock
+SSE_READ_TIMEOUT = 45
+SSE_TEST_SECONDS = 20
+
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
 
 def test_notification():
     """Test JSON-RPC notification (no ID)"""
@@ -26,7 +35,7 @@ def test_notification():
         }
     }
     
-    print(f"📤 Sending notification (no ID): {json.dumps(notification, indent=2)}")
+    print(f"📤 Sending notification (no ID): {format_json(notification)}")
     
     try:
         response = requests.post(
@@ -55,31 +64,45 @@ def test_notification():
     except Exception as e:
         print(f"❌ Error: {e}")
 
+def print_sse_events(response, max_lines=6):
+    """Print the first few lines of an SSE stream"""
+    for i, line in enumerate(response.iter_lines(chunk_size=1024, decode_unicode=True)):
+        if i >= max_lines:
+            break
+        if line:
+            print(f"📥 SSE Event: {line}")
+
 def test_sse_connection():
     """Test SSE connection"""
     print("\n🔍 Testing SSE connection...")
     
     try:
         # Test GET request with SSE accept header
-        response = requests.get(
+        with requests.get(
             f"{MCP_SERVER_URL}/mcp",
             headers={"Accept": "text/event-stream"},
             stream=True,
-            timeout=5
-        )
-        
-        print(f"📥 SSE Response status: {response.status_code}")
-        
-        if response.status_code == 200:
-            print("✅ SSE endpoint accessible")
-            # Read first few events
-            for i, line in enumerate(response.iter_lines()):
-                if i > 5:  # Only read first few lines
-                    break
-                if line:
-                    print(f"📥 SSE Event: {line.decode('utf-8')}")
-        else:
-            print(f"❌ SSE endpoint returned: {response.status_code}")
+            timeout=(5, SSE_READ_TIMEOUT)
+        ) as response:
+            print(f"📥 SSE Response status: {response.status_code}")
+            
+            if response.status_code == 200:
+                print("✅ SSE endpoint accessible")
+                # Read first few events on a worker so the run is bounded by
+                # wall clock rather than by however long the stream stays quiet
+                executor = ThreadPoolExecutor(max_workers=1)
+                reader = executor.submit(print_sse_events, response)
+                try:
+                    reader.result(timeout=SSE_TEST_SECONDS)
+                except FutureTimeout:
+                    print(f"ℹ️  No further SSE events within {SSE_TEST_SECONDS}s, stopping")
+                finally:
+                    response.close()
+                    # Don't wait for a reader still blocked on the socket; it
+                    # ends on its own by SSE_READ_TIMEOUT at the latest
+                    executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                print(f"❌ SSE endpoint returned: {response.status_code}")
             
     except Exception as e:
         print(f"❌ SSE Error: {e}")
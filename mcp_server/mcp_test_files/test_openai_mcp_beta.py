@@ -1,116 +1,149 @@
 #!/usr/bin/env python3
 """Test OpenAI MCP integration using the correct beta API"""
 
-import os
-from openai import OpenAI
+from openai_client import get_async_client
+from stream_output import ChunkSmoother, write_smoothed
 from dotenv import load_dotenv
+import asyncio
 import json
+import sys
+import pytest
 
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+MCP_TOOLS = [
+    {
+        "type": "mcp",
+        "server_label": "utjfc_registration",
+        "server_url": "https://utjfc-mcp-server.replit.app/mcp",
+        "require_approval": "never"
+    }
+]
 
-def test_openai_mcp_integration():
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a helpful assistant with access to UTJFC registration tools via MCP."
+}
+
+# Longest single item we echo to the console
+MAX_PRINT_CHARS = 2000
+
+def _truncate(s, n=MAX_PRINT_CHARS):
+    return s if len(s) <= n else s[:n] + f"...<+{len(s) - n} chars>"
+
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
+async def stream_response(aclient, **kwargs):
+    """Stream a response, printing text deltas as they arrive, and return the completed response"""
+    final = None
+    last_event = None
+    smoother = ChunkSmoother()
+    stream = await aclient.responses.create(stream=True, **kwargs)
+    async for event in stream:
+        if event.type == "response.output_text.delta":
+            write_smoothed(smoother.feed(event.delta))
+        elif event.type == "response.output_item.added":
+            write_smoothed(smoother.flush())
+            if event.item.type == "mcp_call":
+                print(f"\n🔧 MCP Tool Called: {event.item.name}", flush=True)
+            elif event.item.type == "mcp_list_tools":
+                print(f"\n🔧 Listing tools on {event.item.server_label}...", flush=True)
+        elif event.type == "response.completed":
+            final = event.response
+        last_event = event.type
+    write_smoothed(smoother.flush())
+    print()
+    if final is None:
+        # e.g. a response.failed or response.incomplete ending, or a dropped stream
+        raise RuntimeError(f"Stream ended without response.completed (last event: {last_event})")
+    return final
+
+async def run_openai_mcp_integration():
     """Test if OpenAI can connect to and use the MCP server"""
     print("🚀 Testing OpenAI MCP Integration with Beta API")
     print("=" * 50)
     
-    # Create a response with MCP server configuration
-    print("📤 Creating OpenAI response with MCP server...")
+    # The two requests are independent, so issue them concurrently; the tool
+    # listing is streamed to the console while the tool-usage call runs
+    print("📤 Creating OpenAI responses with MCP server (tool listing + tool usage)...")
     
     try:
-        # Use the responses API (not beta.responses)
-        response = client.responses.create(
-            model="gpt-4.1",
-            input=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant with access to UTJFC registration tools via MCP."
-                },
-                {
-                    "role": "user",
-                    "content": "Can you check what tools are available to you? List them and describe what they do."
-                }
-            ],
-            tools=[
-                {
-                    "type": "mcp",
-                    "server_label": "utjfc_registration",
-                    "server_url": "https://utjfc-mcp-server.replit.app/mcp",
-                    "require_approval": "never"
-                }
-            ]
-        )
+        async with get_async_client() as aclient:
+            print(f"\n📥 Assistant response:")
+            print("-" * 50)
+            # Use the responses API (not beta.responses)
+            response, response2 = await asyncio.gather(
+                stream_response(
+                    aclient,
+                    model="gpt-4.1",
+                    input=[
+                        SYSTEM_MESSAGE,
+                        {
+                            "role": "user",
+                            "content": "Can you check what tools are available to you? List them and describe what they do."
+                        }
+                    ],
+                    tools=MCP_TOOLS
+                ),
+                aclient.responses.create(
+                    model="gpt-4.1",
+                    input=[
+                        SYSTEM_MESSAGE,
+                        {
+                            "role": "user",
+                            "content": "Please use the airtable tool to check how many players are registered for the 2526 season."
+                        }
+                    ],
+                    tools=MCP_TOOLS
+                )
+            )
         
-        print("✅ Response created successfully!")
+            print("-" * 50)
+        
+        print("✅ Responses created successfully!")
         print(f"\n📥 Response ID: {response.id}")
         print(f"Model: {response.model}")
         
-        # Check the output
-        if hasattr(response, 'output_text') and response.output_text:
-            print(f"\n📥 Assistant response:")
-            print("-" * 50)
-            print(response.output_text)
-            print("-" * 50)
-        elif hasattr(response, 'output') and response.output:
-            print(f"\n📥 Response outputs:")
+        # The text was already streamed; only show the raw outputs if there was none
+        if not response.output_text and response.output:
+            write = sys.stdout.write
+            write(f"\n📥 Response outputs:\n")
             for i, output in enumerate(response.output):
-                print(f"\nOutput {i+1}:")
-                print(f"  Type: {output.type}")
+                write(f"\nOutput {i+1}:\n")
+                write(f"  Type: {output.type}\n")
                 if output.type == 'message' and hasattr(output, 'content'):
                     for content in output.content:
                         if hasattr(content, 'text'):
-                            print(f"  Text: {content.text}")
+                            write(f"  Text: {_truncate(content.text)}\n")
                 elif output.type == 'mcp_list_tools':
-                    print(f"  Server: {output.server_label}")
-                    print(f"  Tools: {len(output.tools)} available")
+                    write(f"  Server: {output.server_label}\n")
+                    write(f"  Tools: {len(output.tools)} available\n")
                     for tool in output.tools:
-                        print(f"    - {tool['name']}: {tool.get('description', 'No description')}")
+                        write(f"    - {tool['name']}: {_truncate(tool.get('description', 'No description'))}\n")
+            sys.stdout.flush()
         
         # Test actual tool usage
-        print("\n📤 Testing actual tool usage...")
-        
-        response2 = client.responses.create(
-            model="gpt-4.1",
-            input=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant with access to UTJFC registration tools via MCP."
-                },
-                {
-                    "role": "user",
-                    "content": "Please use the airtable tool to check how many players are registered for the 2526 season."
-                }
-            ],
-            tools=[
-                {
-                    "type": "mcp",
-                    "server_label": "utjfc_registration",
-                    "server_url": "https://utjfc-mcp-server.replit.app/mcp",
-                    "require_approval": "never"
-                }
-            ]
-        )
-        
         print("\n📥 Response with tool usage:")
         print("-" * 50)
         
         if hasattr(response2, 'output_text') and response2.output_text:
-            print(response2.output_text)
+            print(_truncate(response2.output_text))
         elif hasattr(response2, 'output') and response2.output:
+            write = sys.stdout.write
             for output in response2.output:
                 if output.type == 'message' and hasattr(output, 'content'):
                     for content in output.content:
                         if hasattr(content, 'text'):
-                            print(content.text)
+                            write(_truncate(content.text) + "\n")
                 elif output.type == 'mcp_call':
-                    print(f"\n🔧 MCP Tool Called:")
-                    print(f"  Tool: {output.name}")
-                    print(f"  Arguments: {output.arguments}")
+                    write(f"\n🔧 MCP Tool Called:\n")
+                    write(f"  Tool: {output.name}\n")
+                    write(f"  Arguments: {_truncate(output.arguments)}\n")
                     if hasattr(output, 'output'):
-                        print(f"  Result: {output.output}")
+                        write(f"  Result: {_truncate(str(output.output))}\n")
+            sys.stdout.flush()
         
         print("-" * 50)
         print("\n✅ OpenAI MCP integration test completed!")
@@ -127,5 +160,8 @@ def test_openai_mcp_integration():
             print(f"Response status: {e.response.status_code if hasattr(e.response, 'status_code') else 'N/A'}")
             print(f"Response body: {e.response.text if hasattr(e.response, 'text') else 'N/A'}")
 
+def test_openai_mcp_integration():
+    asyncio.run(run_openai_mcp_integration())
+
 if __name__ == "__main__":
     test_openai_mcp_integration() 
\ No newline at end of file
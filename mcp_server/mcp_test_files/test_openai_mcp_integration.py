@@ -1,16 +1,20 @@
 #!/usr/bin/env python3
 """Test OpenAI integration with the deployed MCP server"""
 
-import os
-from openai import OpenAI
+from openai_client import get_client
+from stream_output import ChunkSmoother, write_smoothed
 from dotenv import load_dotenv
 import json
+import pytest
 
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Shared OpenAI client
+client = get_client()
+
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
 
 def test_openai_mcp_integration():
     """Test if OpenAI can connect to and use the MCP server"""
@@ -50,11 +54,13 @@ def test_openai_mcp_integration():
         
         # Collect the full response
         full_response = ""
+        smoother = ChunkSmoother()
         for chunk in response:
             if chunk.choices[0].delta.content:
                 content = chunk.choices[0].delta.content
-                print(content, end="", flush=True)
+                write_smoothed(smoother.feed(content))
                 full_response += content
+        write_smoothed(smoother.flush())
         
         print("\n" + "-" * 50)
         
@@ -87,17 +93,20 @@ def test_openai_mcp_integration():
         print("\n📥 Assistant response with tool usage:")
         print("-" * 50)
         
+        smoother = ChunkSmoother()
         for chunk in response2:
             if chunk.choices[0].delta.content:
-                print(chunk.choices[0].delta.content, end="", flush=True)
+                write_smoothed(smoother.feed(chunk.choices[0].delta.content))
             
             # Check for tool calls
             if hasattr(chunk.choices[0].delta, 'tool_calls') and chunk.choices[0].delta.tool_calls:
+                write_smoothed(smoother.flush())
                 for tool_call in chunk.choices[0].delta.tool_calls:
                     if tool_call.function:
                         print(f"\n🔧 Tool called: {tool_call.function.name}")
                         if tool_call.function.arguments:
                             print(f"   Arguments: {tool_call.function.arguments}")
+        write_smoothed(smoother.flush())
         
         print("\n" + "-" * 50)
         print("\n✅ OpenAI MCP integration test completed!")
@@ -5,8 +5,9 @@ Simple test to debug OpenAI's connection to the MCP server
 
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai_client import get_client
 import time
+import pytest
 
 # Load environment variables
 load_dotenv()
@@ -15,11 +16,14 @@ load_dotenv()
 MCP_SERVER_URL = "https://utjfc-mcp-server.replit.app"
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
 def test_openai_basic():
     """Test basic OpenAI call without MCP"""
     print("🔍 Testing basic OpenAI call (no MCP)...")
     
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    client = get_client()
     
     try:
         response = client.chat.completions.create(
@@ -37,7 +41,7 @@ def test_openai_mcp_minimal():
     """Test minimal MCP connection"""
     print("\n🔍 Testing minimal MCP connection...")
     
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    client = get_client()
     
     try:
         print(f"📡 Connecting to MCP server at: {MCP_SERVER_URL}/mcp")
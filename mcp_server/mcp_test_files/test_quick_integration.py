@@ -4,27 +4,39 @@ Quick Integration Test - Non-blocking version
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
+import pytest
 
 # Configuration
 BACKEND_URL = "http://localhost:8000"
 MCP_SERVER_URL = "https://utjfc-mcp-server.replit.app"
 
+# One keep-alive session so repeated calls reuse the same connection
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=Retry(total=2, backoff_factor=0.3))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
 def test_quick_chat():
     """Test a quick chat interaction"""
     print("🧪 Quick Integration Test")
     print("=" * 40)
     
     # Clear history
-    requests.post(f"{BACKEND_URL}/clear")
+    SESSION.post(f"{BACKEND_URL}/clear")
     
     # Send test message
     test_message = "How many players are registered for season 2526?"
     print(f"\n📤 Sending: {test_message}")
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BACKEND_URL}/chat",
             json={"user_message": test_message},
             timeout=45  # 45 second timeout
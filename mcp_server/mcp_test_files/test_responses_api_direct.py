@@ -3,19 +3,22 @@
 Direct test of OpenAI Responses API
 """
 
-from openai import OpenAI
+from openai_client import get_client
 from dotenv import load_dotenv
-import os
+import pytest
 
 load_dotenv()
 
+# These tests hit live servers; run them with `pytest -m integration`
+pytestmark = pytest.mark.integration
+
 def test_responses_api():
     """Test if Responses API is available in the OpenAI SDK"""
     print("🔍 Testing OpenAI Responses API Availability")
     print("=" * 60)
     
     try:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = get_client()
         
         # Check if responses attribute exists
         print(f"✅ Client has 'responses' attribute: {hasattr(client, 'responses')}")
@@ -47,7 +50,7 @@ def test_responses_api():
         if "model" in str(e).lower():
             print("\n🔄 Retrying with gpt-4.1 model...")
             try:
-                client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+                client = get_client()
                 response = client.responses.create(
                     model="gpt-4.1",
                     input="Say hello"
@@ -65,7 +68,7 @@ def test_code_interpreter():
     print("=" * 60)
     
     try:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = get_client()
         
         print("📝 Testing with code interpreter tool...")
         
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Semantic response cache for read-only Airtable queries.
+
+Queries are matched on embedding cosine similarity rather than exact text,
+so "how many players are registered" and "how many registered players are
+there" share one Airtable + LLM round-trip. Entries are kept per season,
+expire after a TTL and are evicted least-recently-used.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+class SemanticCache:
+    """Thread-safe nearest-neighbour cache keyed on (season, unit-normalized embedding)"""
+
+    def __init__(self, threshold: float = 0.95, maxsize: int = 256, ttl: float = 60):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._ids = itertools.count()
+        # entry id -> (season, embedding, value, stored_at), oldest first
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        # season -> (entry ids, stacked embeddings), rebuilt lazily after changes
+        self._matrices: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, season: str, embedding: np.ndarray) -> Optional[str]:
+        """Return the cached value for the most similar query, if similar enough"""
+        with self._lock:
+            self._expire()
+            ids, matrix = self._matrix(season)
+            if not ids:
+                self.misses += 1
+                return None
+            scores = matrix @ embedding
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+            entry_id = ids[best]
+            self._entries.move_to_end(entry_id)
+            self.hits += 1
+            return self._entries[entry_id][2]
+
+    def put(self, season: str, embedding: np.ndarray, value: str):
+        with self._lock:
+            self._entries[next(self._ids)] = (season, embedding, value, time.monotonic())
+            self._matrices.pop(season, None)
+            while len(self._entries) > self.maxsize:
+                _, (evicted_season, *_) = self._entries.popitem(last=False)
+                self._matrices.pop(evicted_season, None)
+
+    def clear(self, season: str):
+        """Drop every entry for a season"""
+        with self._lock:
+            for entry_id in [entry_id for entry_id, entry in self._entries.items() if entry[0] == season]:
+                del self._entries[entry_id]
+            self._matrices.pop(season, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "threshold": self.threshold
+            }
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        expired = [entry_id for entry_id, entry in self._entries.items() if entry[3] < cutoff]
+        for entry_id in expired:
+            season = self._entries.pop(entry_id)[0]
+            self._matrices.pop(season, None)
+
+    def _matrix(self, season: str) -> tuple:
+        if season not in self._matrices:
+            ids = [entry_id for entry_id, entry in self._entries.items() if entry[0] == season]
+            matrix = np.stack([self._entries[entry_id][1] for entry_id in ids]) if ids else None
+            self._matrices[season] = (ids, matrix)
+        return self._matrices[season]
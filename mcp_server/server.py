@@ -7,16 +7,27 @@ UTJFC player registrations through Airtable integration.
 """
 
 import os
-import json
+import re
+import hashlib
+import hmac
+import orjson
 import asyncio
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from functools import lru_cache
+from cachetools import TTLCache
+import numpy as np
+from openai import OpenAI
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request, Response, HTTPException
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi import FastAPI, Request, Response, HTTPException, Depends
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from typing import AsyncGenerator, Optional, Dict, Any
 import uuid
+from collections import defaultdict, deque
 
 # Load environment variables
 load_dotenv()
@@ -25,11 +36,14 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+from semantic_cache import SemanticCache
+
 # Import our Airtable tool
 from tools.airtable.airtable_agent import execute_airtable_request
+from tools.airtable.airtable_setup import get_airtable_client, get_http_client
 
 # Create FastAPI app
-app = FastAPI(title="UTJFC Registration MCP Server")
+app = FastAPI(title="UTJFC Registration MCP Server", default_response_class=ORJSONResponse)
 
 # Add CORS middleware - be more restrictive in production
 app.add_middleware(
@@ -44,7 +58,7 @@ app.add_middleware(
 # Tool definition
 AIRTABLE_TOOL = {
     "name": "airtable_database_operation",
-    "description": "Execute CRUD operations on UTJFC registration database with automatic data validation and normalization.",
+    "description": "Create, read, update or delete UTJFC player registrations using a natural language query. Use for any registration lookup or change. Input data is normalized to the schema (see resources://airtable/normalization). Returns JSON with status, message and data.",
     "inputSchema": {
         "type": "object",
         "properties": {
@@ -62,26 +76,577 @@ AIRTABLE_TOOL = {
     }
 }
 
+CACHE_STATS_TOOL = {
+    "name": "cache_stats",
+    "description": "Report hit/miss counts and size of the read-only query cache.",
+    "inputSchema": {
+        "type": "object",
+        "properties": {}
+    }
+}
+
+START_AIRTABLE_JOB_TOOL = {
+    "name": "start_airtable_job",
+    "description": "Start a long-running airtable_database_operation in the background and return a job_id to poll.",
+    "inputSchema": AIRTABLE_TOOL["inputSchema"]
+}
+
+POLL_AIRTABLE_JOB_TOOL = {
+    "name": "poll_airtable_job",
+    "description": "Check a job started with start_airtable_job. Returns pending, done with the result, or error.",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "job_id": {
+                "type": "string",
+                "description": "The job_id returned by start_airtable_job"
+            }
+        },
+        "required": ["job_id"]
+    }
+}
+
+BATCH_AIRTABLE_TOOL = {
+    "name": "batch_airtable_operations",
+    "description": "Run several independent airtable_database_operation queries for one season concurrently and return all results in one response.",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "season": AIRTABLE_TOOL["inputSchema"]["properties"]["season"],
+            "queries": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Natural language database operations to run"
+            },
+            "max_concurrent": {
+                "type": "integer",
+                "description": "Maximum queries in flight at once (default 4)"
+            },
+            "stop_on_error": {
+                "type": "boolean",
+                "description": "Stop after the first failure (default false). Queries not yet started are reported as cancelled; ones already running are reported as abandoned and may still have taken effect"
+            }
+        },
+        "required": ["season", "queries"]
+    }
+}
+
+# Detail the tool description used to carry; served on demand via resources/read
+# so it isn't repeated in every tools/list response
+NORMALIZATION_RESOURCE_URI = "resources://airtable/normalization"
+NORMALIZATION_GUIDE = """# Airtable data normalization
+
+airtable_database_operation validates and normalizes data against the table
+schema before writing, converting informal formats to schema-compliant ones.
+
+## Examples
+- Age groups: "u10s" → "U10", "under 12" → "U12"
+- Team names: "tigers" → "Tigers", "eagles" → "Eagles"
+- Medical flags: "yes" → "Y", "no" → "N"
+- Names: Proper case formatting
+
+## Example queries
+- "Create registration for Seb Charlton, age u10s, tigers team, parent John Charlton"
+- "Find all players with medical issues"
+- "Update Stefan Hayton's team to Eagles"
+- "Show all U12 players"
+- "Delete registration for duplicate entry"
+
+Include all relevant data in the query - the tool will validate and normalize it.
+"""
+
+RESOURCES = [
+    {
+        "uri": NORMALIZATION_RESOURCE_URI,
+        "name": "Airtable normalization guide",
+        "description": "How airtable_database_operation normalizes input, with example queries.",
+        "mimeType": "text/markdown"
+    }
+]
+
+FIND_RELEVANT_TOOLS_TOOL = {
+    "name": "find_relevant_tools",
+    "description": "Return the schemas of the tools most relevant to a task, ranked by semantic similarity.",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "What you are trying to do"
+            },
+            "top_k": {
+                "type": "integer",
+                "description": "Maximum number of tools to return (default 5)"
+            }
+        },
+        "required": ["query"]
+    }
+}
+
+TOOLS = [AIRTABLE_TOOL, BATCH_AIRTABLE_TOOL, START_AIRTABLE_JOB_TOOL, POLL_AIRTABLE_JOB_TOOL, CACHE_STATS_TOOL, FIND_RELEVANT_TOOLS_TOOL]
+TOOL_NAMES = {tool["name"] for tool in TOOLS}
+
+# TOOLS is fixed at import time, so the tools/list validator is computed once.
+# Clients compare it to decide whether to refresh their copy; the response
+# always carries the full JSON-RPC body (a bodiless 304 isn't a valid reply)
+TOOLS_ETAG = f'"{hashlib.blake2b(orjson.dumps(TOOLS), digest_size=8).hexdigest()}"'
+TOOLS_CACHE_HEADERS = {
+    "ETag": TOOLS_ETAG,
+    "Cache-Control": "max-age=60, stale-while-revalidate=300"
+}
+VALID_SEASONS = frozenset({"2526", "2425"})
+
+# Read-only query cache - identical reads within the TTL skip Airtable entirely
+MCP_CACHE_TTL = int(os.getenv("MCP_CACHE_TTL", "60"))
+READ_QUERY_PATTERN = re.compile(r"^\s*(how many|list|get|find|show|count)\b", re.IGNORECASE)
+query_cache = TTLCache(maxsize=512, ttl=MCP_CACHE_TTL)
+query_cache_lock = threading.Lock()
+cache_counters = {"hits": 0, "misses": 0}
+# Bumped by every write so a read that was in flight across it isn't cached
+season_generation: Dict[str, int] = defaultdict(int)
+
+# Near-duplicate reads (by query embedding) can share a result too. Off by
+# default: short queries that differ only by a name or age group ("list u9
+# players" vs "list u10 players") embed almost identically, so a "hit" can be
+# another query's answer. Set MCP_SEMANTIC_CACHE=true to opt in
+MCP_SEMANTIC_CACHE = os.getenv("MCP_SEMANTIC_CACHE", "false").lower() == "true"
+# Longest a read waits for its embedding before going to Airtable anyway
+SEMANTIC_LOOKUP_TIMEOUT = 0.2
+embedding_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="query-embedding")
+semantic_cache = SemanticCache(
+    threshold=float(os.getenv("MCP_SEMANTIC_THRESHOLD", "0.95")),
+    maxsize=256,
+    ttl=MCP_CACHE_TTL
+)
+
+def query_embedding(query: str) -> Optional[np.ndarray]:
+    """Embedding for semantic lookup, or None if the embeddings API is unavailable"""
+    try:
+        return embed_text(query.strip().lower())
+    except Exception as e:
+        logger.warning(f"Query embedding failed, skipping semantic cache: {e}")
+        return None
+
+def store_semantic(season: str, generation: int, embedding_future, value: str):
+    """Add a read result to the semantic cache once its embedding arrives"""
+    embedding = embedding_future.result()
+    if embedding is None:
+        return
+    with query_cache_lock:
+        if season_generation[season] != generation:
+            return
+    semantic_cache.put(season, embedding, value)
+
+def to_json(obj) -> str:
+    """Compact JSON text for tool results and SSE events"""
+    return orjson.dumps(obj).decode()
+
+# Pre-serialized so the rejection path skips both Airtable and serialization
+INVALID_SEASON_RESULT = to_json({
+    "status": "error",
+    "message": f"Invalid season. Must be one of: {', '.join(sorted(VALID_SEASONS))}",
+    "data": None
+})
+
+# Loop detection - the same failing query retried too often in a short window
+# gets a fast "circuit_open" answer instead of another Airtable + LLM round-trip
+FAILURE_WINDOW_SECONDS = 30
+FAILURE_THRESHOLD = 3
+failure_times: Dict[tuple, deque] = defaultdict(deque)
+failure_lock = threading.Lock()
+CIRCUIT_OPEN_RESULT = to_json({
+    "status": "error",
+    "message": "circuit_open",
+    "retry_after": FAILURE_WINDOW_SECONDS,
+    "data": None
+})
+
+def circuit_open(key: tuple) -> bool:
+    """True if key has failed FAILURE_THRESHOLD times within the window"""
+    cutoff = time.monotonic() - FAILURE_WINDOW_SECONDS
+    with failure_lock:
+        times = failure_times.get(key)
+        if not times:
+            return False
+        while times and times[0] < cutoff:
+            times.popleft()
+        if not times:
+            del failure_times[key]
+            return False
+        return len(times) >= FAILURE_THRESHOLD
+
+def record_failure(key: tuple):
+    with failure_lock:
+        failure_times[key].append(time.monotonic())
+
+def invalidate_season_reads(season: str):
+    """Drop a season's cached reads once a write may have changed them"""
+    with query_cache_lock:
+        season_generation[season] += 1
+        for key in [key for key in list(query_cache) if key[0] == season]:
+            query_cache.pop(key, None)
+    semantic_cache.clear(season)
+
+def run_airtable_query(season: str, query: str) -> str:
+    """Execute an Airtable query and return the serialized result, caching reads"""
+    if season not in VALID_SEASONS:
+        return INVALID_SEASON_RESULT
+    
+    is_read = READ_QUERY_PATTERN.match(query or "") is not None
+    key = (season, (query or "").strip().lower())
+    embedding_future = None
+    
+    if is_read:
+        with query_cache_lock:
+            generation = season_generation[season]
+            cached = query_cache.get(key)
+            if cached is not None:
+                cache_counters["hits"] += 1
+                return cached
+            cache_counters["misses"] += 1
+        
+        if MCP_SEMANTIC_CACHE:
+            # Fetched on its own pool: a slow embeddings call only delays the
+            # lookup by SEMANTIC_LOOKUP_TIMEOUT, after which it's used to store
+            embedding_future = embedding_executor.submit(query_embedding, query)
+            try:
+                embedding = embedding_future.result(timeout=SEMANTIC_LOOKUP_TIMEOUT)
+            except FutureTimeout:
+                embedding = None
+            if embedding is not None:
+                cached = semantic_cache.get(season, embedding)
+                if cached is not None:
+                    return cached
+    
+    if circuit_open(key):
+        logger.warning(f"Circuit open for {key}; skipping Airtable")
+        return CIRCUIT_OPEN_RESULT
+    
+    try:
+        result = execute_airtable_request(season, query)
+    except Exception:
+        record_failure(key)
+        raise
+    text = to_json(result)
+    
+    if result.get("status") == "error":
+        record_failure(key)
+    else:
+        with failure_lock:
+            failure_times.pop(key, None)
+        if not is_read:
+            invalidate_season_reads(season)
+        # Only cache successful reads so transient failures are retried
+        elif result.get("status") == "success":
+            with query_cache_lock:
+                if season_generation[season] != generation:
+                    return text
+                query_cache[key] = text
+            if embedding_future is not None:
+                value = to_json({**result, "cache": "hit"})
+                embedding_future.add_done_callback(
+                    lambda future: store_semantic(season, generation, future, value)
+                )
+    return text
+
+def cache_stats() -> dict:
+    """Snapshot of the read-only query cache"""
+    with query_cache_lock:
+        return {
+            **cache_counters,
+            "size": len(query_cache),
+            "maxsize": query_cache.maxsize,
+            "ttl": query_cache.ttl,
+            "semantic": semantic_cache.stats()
+        }
+
+# Background Airtable jobs - lets clients avoid holding a request open for
+# the whole Airtable + LLM round-trip
+JOB_RETENTION_SECONDS = 300
+job_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="airtable-job")
+jobs: Dict[str, Dict[str, Any]] = {}
+
+def start_airtable_job(season: str, query: str) -> dict:
+    """Submit an Airtable query to the job pool"""
+    job_id = uuid.uuid4().hex
+    jobs[job_id] = {
+        # Same validation, caching and circuit breaker as a direct call
+        "future": job_executor.submit(run_airtable_query, season, query),
+        "created_at": time.monotonic()
+    }
+    return {"job_id": job_id, "status": "pending"}
+
+def poll_airtable_job(job_id: str) -> dict:
+    """Report the state of a background Airtable job"""
+    job = jobs.get(job_id)
+    if job is None:
+        return {"job_id": job_id, "status": "error", "error": "Unknown or expired job_id"}
+    
+    future = job["future"]
+    if not future.done():
+        return {"job_id": job_id, "status": "pending"}
+    
+    job.setdefault("finished_at", time.monotonic())
+    error = future.exception()
+    if error is not None:
+        return {"job_id": job_id, "status": "error", "error": str(error)}
+    return {"job_id": job_id, "status": "done", "result": orjson.loads(future.result())}
+
+async def sweep_finished_jobs():
+    """Evict jobs that finished more than JOB_RETENTION_SECONDS ago"""
+    while True:
+        await asyncio.sleep(60)
+        cutoff = time.monotonic() - JOB_RETENTION_SECONDS
+        for job_id, job in list(jobs.items()):
+            if job["future"].done():
+                finished_at = job.setdefault("finished_at", time.monotonic())
+                if finished_at < cutoff:
+                    del jobs[job_id]
+
+async def batch_airtable_operations(season: str, queries: list, max_concurrent: int = 4, stop_on_error: bool = False) -> list:
+    """Fan a list of queries out to run_airtable_query concurrently"""
+    if season not in VALID_SEASONS:
+        raise ValueError(f"Invalid season: {season}")
+    
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    # Indices already handed to a worker thread; cancelling the task can't stop those
+    started = set()
+    
+    async def run_one(index: int, query: str) -> dict:
+        async with semaphore:
+            started.add(index)
+            try:
+                result = orjson.loads(await asyncio.to_thread(run_airtable_query, season, query))
+            except Exception as e:
+                return {"index": index, "status": "error", "error": str(e)}
+        if result.get("status") == "error":
+            return {"index": index, "status": "error", "error": result.get("message")}
+        return {"index": index, "status": "success", "data": result.get("data")}
+    
+    tasks = [asyncio.create_task(run_one(i, query)) for i, query in enumerate(queries)]
+    results = [{"index": i, "status": "cancelled"} for i in range(len(queries))]
+    
+    for next_done in asyncio.as_completed(tasks):
+        entry = await next_done
+        results[entry["index"]] = entry
+        if stop_on_error and entry["status"] == "error":
+            for index, task in enumerate(tasks):
+                if task.done():
+                    # Finished but not yet collected above
+                    results[index] = task.result()
+                elif task.cancel() and index in started:
+                    # Still running in its thread: a write may yet go through
+                    results[index] = {"index": index, "status": "abandoned"}
+            break
+    
+    return results
+
+async def call_tool(tool_name: str, arguments: dict) -> str:
+    """Run a tool and return its text content"""
+    if tool_name == "batch_airtable_operations":
+        results = await batch_airtable_operations(
+            arguments.get("season"),
+            arguments.get("queries", []),
+            arguments.get("max_concurrent", 4),
+            arguments.get("stop_on_error", False)
+        )
+        return to_json(results)
+    if tool_name == "start_airtable_job":
+        return to_json(start_airtable_job(arguments.get("season"), arguments.get("query")))
+    if tool_name == "poll_airtable_job":
+        return to_json(poll_airtable_job(arguments.get("job_id")))
+    if tool_name == "cache_stats":
+        return to_json(cache_stats())
+    if tool_name == "find_relevant_tools":
+        loop = asyncio.get_running_loop()
+        tools = await loop.run_in_executor(None, filter_tools, arguments.get("query", ""), arguments.get("top_k", 5))
+        return to_json({"tools": tools})
+    # Airtable + LLM round-trip is blocking; keep it off the event loop
+    return await asyncio.to_thread(run_airtable_query, arguments.get("season"), arguments.get("query"))
+
+# Semantic tool filtering - tool embeddings are computed once and persisted,
+# keyed by a digest of the tool texts so adding or editing a tool rebuilds them
+EMBEDDING_MODEL = "text-embedding-3-small"
+TOOL_EMBEDDINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool_embeddings.npz")
+tool_embeddings: Optional[np.ndarray] = None
+tool_embeddings_lock = threading.Lock()
+embedding_client = OpenAI(http_client=get_http_client())
+
+def tool_text(tool: dict) -> str:
+    return f"{tool['name']} {tool['description']}"
+
+@lru_cache(maxsize=1024)
+def embed_text(text: str) -> np.ndarray:
+    """Unit-normalized float32 embedding, memoized per text"""
+    response = embedding_client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+def load_tool_embeddings() -> np.ndarray:
+    """Load tool embeddings from disk, or compute and persist them if stale"""
+    global tool_embeddings
+    with tool_embeddings_lock:
+        if tool_embeddings is not None:
+            return tool_embeddings
+        
+        digest = hashlib.blake2b("\n".join(tool_text(t) for t in TOOLS).encode(), digest_size=16).hexdigest()
+        try:
+            saved = np.load(TOOL_EMBEDDINGS_PATH)
+            if str(saved["digest"]) == digest:
+                tool_embeddings = saved["embeddings"]
+                return tool_embeddings
+        except (OSError, KeyError, ValueError):
+            pass
+        
+        tool_embeddings = np.stack([embed_text(tool_text(t)) for t in TOOLS])
+        try:
+            np.savez(TOOL_EMBEDDINGS_PATH, digest=digest, embeddings=tool_embeddings)
+        except OSError as e:
+            logger.warning(f"Could not persist tool embeddings: {e}")
+        return tool_embeddings
+
+def warm_tool_embeddings():
+    try:
+        load_tool_embeddings()
+    except Exception as e:
+        logger.warning(f"Tool embeddings unavailable: {e}")
+
+def filter_tools(user_query: str, top_k: int = 5) -> list:
+    """Return the top_k tool schemas most similar to user_query"""
+    scores = load_tool_embeddings() @ embed_text(user_query)
+    top = np.argsort(scores)[::-1][:max(1, top_k)]
+    return [TOOLS[i] for i in top]
+
+def prewarm_connections():
+    """Open TLS connections to OpenAI and Airtable so the first tool call doesn't pay the handshake"""
+    try:
+        get_http_client().head("https://api.openai.com/v1/models", timeout=5)
+    except Exception as e:
+        logger.debug(f"OpenAI pre-warm failed: {e}")
+    try:
+        get_airtable_client().session.head("https://api.airtable.com/v0/meta/bases", timeout=5)
+    except Exception as e:
+        logger.debug(f"Airtable pre-warm failed: {e}")
+
+MCP_TOOL_WORKERS = int(os.getenv("MCP_TOOL_WORKERS", "32"))
+
 # Store active SSE connections
 active_connections: Dict[str, Dict[str, Any]] = {}
 
 # Optional authentication
 MCP_AUTH_TOKEN = os.getenv("MCP_AUTH_TOKEN")
 
-def check_auth(request: Request) -> bool:
-    """Check if request is authorized"""
-    if not MCP_AUTH_TOKEN:
-        return True  # No auth configured
-    
+AUTH_DISABLED = not MCP_AUTH_TOKEN
+EXPECTED_TOKEN = (MCP_AUTH_TOKEN or "").encode()
+
+def verify_token(headers) -> bool:
+    """Constant-time compare of the bearer or x-mcp-auth-token header"""
     # Check Authorization header
-    auth_header = request.headers.get("authorization", "")
+    auth_header = headers.get("authorization", "")
     if auth_header.startswith("Bearer "):
-        token = auth_header[7:]
-        return token == MCP_AUTH_TOKEN
+        return hmac.compare_digest(auth_header[7:].encode(), EXPECTED_TOKEN)
     
     # Check custom header (for OpenAI)
-    custom_token = request.headers.get("x-mcp-auth-token", "")
-    return custom_token == MCP_AUTH_TOKEN
+    return hmac.compare_digest(headers.get("x-mcp-auth-token", "").encode(), EXPECTED_TOKEN)
+
+def check_auth(request: Request) -> bool:
+    """Check if request is authorized"""
+    return AUTH_DISABLED or verify_token(request.headers)
+
+def require_auth(request: Request):
+    """Route dependency: reject unauthorized requests with 401"""
+    if not check_auth(request):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+# Static results - only the echoed id differs between calls, so these are
+# built once and shared rather than rebuilt per request
+INIT_RESULT = {
+    "protocolVersion": "2025-03-26",
+    "capabilities": {
+        "tools": {},
+        "resources": {}
+    },
+    "serverInfo": {
+        "name": "UTJFC Registration MCP Server",
+        "version": "1.0.0"
+    },
+    # Extension: the tool manifest rides along so clients can skip tools/list.
+    # Spec-conforming clients ignore unknown result fields
+    "tools": TOOLS
+}
+TOOLS_RESULT = {"tools": TOOLS}
+RESOURCES_RESULT = {"resources": RESOURCES}
+
+def rpc_result(jsonrpc: str, request_id, result) -> dict:
+    return {"jsonrpc": jsonrpc, "id": request_id, "result": result}
+
+def rpc_error(jsonrpc: str, request_id, code: int, message: str) -> dict:
+    return {"jsonrpc": jsonrpc, "id": request_id, "error": {"code": code, "message": message}}
+
+# MCP liveness check; the result is always an empty object
+PING_RESULT = {}
+
+def ping_body(request_id) -> bytes:
+    """Serialized ping response for the POST fast path"""
+    return b'{"jsonrpc":"2.0","id":' + orjson.dumps(request_id) + b',"result":{}}'
+
+async def handle_ping(jsonrpc: str, request_id, params: dict) -> dict:
+    return rpc_result(jsonrpc, request_id, PING_RESULT)
+
+async def handle_initialize(jsonrpc: str, request_id, params: dict) -> dict:
+    return rpc_result(jsonrpc, request_id, INIT_RESULT)
+
+async def handle_tools_list(jsonrpc: str, request_id, params: dict) -> dict:
+    return rpc_result(jsonrpc, request_id, TOOLS_RESULT)
+
+async def handle_resources_list(jsonrpc: str, request_id, params: dict) -> dict:
+    return rpc_result(jsonrpc, request_id, RESOURCES_RESULT)
+
+async def handle_resources_read(jsonrpc: str, request_id, params: dict) -> dict:
+    uri = params.get("uri")
+    if uri != NORMALIZATION_RESOURCE_URI:
+        return rpc_error(jsonrpc, request_id, -32602, f"Unknown resource: {uri}")
+    return rpc_result(jsonrpc, request_id, {
+        "contents": [
+            {
+                "uri": uri,
+                "mimeType": "text/markdown",
+                "text": NORMALIZATION_GUIDE
+            }
+        ]
+    })
+
+async def handle_tools_call(jsonrpc: str, request_id, params: dict) -> dict:
+    tool_name = params.get("name")
+    arguments = params.get("arguments", {})
+    
+    if tool_name not in TOOL_NAMES:
+        return rpc_error(jsonrpc, request_id, -32602, f"Unknown tool: {tool_name}")
+    
+    # Execute the tool
+    try:
+        text = await call_tool(tool_name, arguments)
+    except Exception as e:
+        logger.error(f"Tool execution error: {e}")
+        return rpc_error(jsonrpc, request_id, -32603, f"Tool execution failed: {str(e)}")
+    
+    return rpc_result(jsonrpc, request_id, {
+        "content": [
+            {
+                "type": "text",
+                "text": text
+            }
+        ]
+    })
+
+JSONRPC_METHODS = {
+    "ping": handle_ping,
+    "initialize": handle_initialize,
+    "tools/list": handle_tools_list,
+    "tools/call": handle_tools_call,
+    "resources/list": handle_resources_list,
+    "resources/read": handle_resources_read
+}
 
 async def handle_jsonrpc_request(request_data: dict) -> dict:
     """Handle JSON-RPC 2.0 requests"""
@@ -90,118 +655,45 @@ async def handle_jsonrpc_request(request_data: dict) -> dict:
     params = request_data.get("params", {})
     request_id = request_data.get("id")
     
-    try:
-        if method == "initialize":
-            # Handle initialization
-            return {
-                "jsonrpc": jsonrpc,
-                "id": request_id,
-                "result": {
-                    "protocolVersion": "2025-03-26",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "serverInfo": {
-                        "name": "UTJFC Registration MCP Server",
-                        "version": "1.0.0"
-                    }
-                }
-            }
-        
-        elif method == "tools/list":
-            # Return list of available tools
-            return {
-                "jsonrpc": jsonrpc,
-                "id": request_id,
-                "result": {
-                    "tools": [AIRTABLE_TOOL]
-                }
-            }
-        
-        elif method == "tools/call":
-            # Execute tool call
-            tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-            
-            if tool_name != "airtable_database_operation":
-                return {
-                    "jsonrpc": jsonrpc,
-                    "id": request_id,
-                    "error": {
-                        "code": -32602,
-                        "message": f"Unknown tool: {tool_name}"
-                    }
-                }
-            
-            # Execute the tool
-            try:
-                result = execute_airtable_request(
-                    arguments.get("season"),
-                    arguments.get("query")
-                )
-                
-                return {
-                    "jsonrpc": jsonrpc,
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps(result, indent=2)
-                            }
-                        ]
-                    }
-                }
-            except Exception as e:
-                logger.error(f"Tool execution error: {e}")
-                return {
-                    "jsonrpc": jsonrpc,
-                    "id": request_id,
-                    "error": {
-                        "code": -32603,
-                        "message": f"Tool execution failed: {str(e)}"
-                    }
-                }
-        
-        else:
-            # Method not found
-            return {
-                "jsonrpc": jsonrpc,
-                "id": request_id,
-                "error": {
-                    "code": -32601,
-                    "message": f"Method not found: {method}"
-                }
-            }
+    handler = JSONRPC_METHODS.get(method)
+    if handler is None:
+        return rpc_error(jsonrpc, request_id, -32601, f"Method not found: {method}")
     
+    try:
+        return await handler(jsonrpc, request_id, params)
     except Exception as e:
         logger.error(f"Error handling JSON-RPC request: {e}")
-        return {
-            "jsonrpc": jsonrpc,
-            "id": request_id,
-            "error": {
-                "code": -32603,
-                "message": f"Internal error: {str(e)}"
-            }
-        }
+        return rpc_error(jsonrpc, request_id, -32603, f"Internal error: {str(e)}")
+
+KEEPALIVE_INTERVAL_SECONDS = 30
+KEEPALIVE_FRAME = b": keepalive\n\n"
+KEEPALIVE_SENTINEL = object()
+
+async def keepalive_broadcaster():
+    """One timer for every SSE connection: queue a keepalive on each interval"""
+    while True:
+        await asyncio.sleep(KEEPALIVE_INTERVAL_SECONDS)
+        for connection in list(active_connections.values()):
+            connection["queue"].put_nowait(KEEPALIVE_SENTINEL)
 
-async def sse_generator(connection_id: str) -> AsyncGenerator[str, None]:
+def sse_frame(obj) -> bytes:
+    """Encode one SSE data frame straight to bytes"""
+    return b"data: " + orjson.dumps(obj) + b"\n\n"
+
+async def sse_generator(connection_id: str) -> AsyncGenerator[bytes, None]:
     """Generate SSE events for a connection"""
     try:
         # Send initial connection event
-        yield f"data: {json.dumps({'type': 'connection', 'status': 'connected'})}\n\n"
+        yield sse_frame({'type': 'connection', 'status': 'connected'})
         
-        # Keep connection alive
+        # Sleep until a message (or a broadcast keepalive) is queued
+        queue = active_connections[connection_id]["queue"]
         while connection_id in active_connections:
-            # Check if there are any pending messages for this connection
-            if active_connections[connection_id].get("pending_messages"):
-                message = active_connections[connection_id]["pending_messages"].pop(0)
-                yield f"data: {json.dumps(message)}\n\n"
+            message = await queue.get()
+            if message is KEEPALIVE_SENTINEL:
+                yield KEEPALIVE_FRAME
             else:
-                # Send keepalive
-                await asyncio.sleep(30)
-                if connection_id in active_connections:
-                    yield ": keepalive\n\n"
+                yield sse_frame(message)
     
     except asyncio.CancelledError:
         logger.info(f"SSE connection {connection_id} cancelled")
@@ -209,10 +701,40 @@ async def sse_generator(connection_id: str) -> AsyncGenerator[str, None]:
         if connection_id in active_connections:
             del active_connections[connection_id]
 
-@app.get("/")
-async def root():
-    """Root endpoint - health check"""
-    return JSONResponse({
+REQUIRED_ENV_VARS = ("OPENAI_API_KEY", "AIRTABLE_API_KEY")
+
+def check_environment() -> bool:
+    """Log missing configuration; True when the required API keys are set"""
+    missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
+    if missing_vars:
+        logger.warning(f"⚠️  Missing environment variables: {missing_vars} - please set them in Replit Secrets")
+    else:
+        logger.info("✅ Environment variables configured")
+    
+    if MCP_AUTH_TOKEN:
+        logger.info("🔐 Authentication enabled")
+    else:
+        logger.warning("⚠️  No authentication configured (set MCP_AUTH_TOKEN for security)")
+    return not missing_vars
+
+@app.on_event("startup")
+async def start_background_tasks():
+    """Check configuration, size the tool thread pool, start the sweepers, build tool embeddings and pre-warm connections"""
+    loop = asyncio.get_running_loop()
+    # Blocking tool calls run on the default executor; the stdlib default
+    # (cpu_count + 4) is too small for many concurrent Airtable round-trips
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=MCP_TOOL_WORKERS, thread_name_prefix="mcp-tool"))
+    asyncio.create_task(sweep_finished_jobs())
+    asyncio.create_task(keepalive_broadcaster())
+    loop.run_in_executor(None, warm_tool_embeddings)
+    # Runs in every worker process (uvicorn or gunicorn), not just a launcher
+    if check_environment():
+        loop.run_in_executor(None, prewarm_connections)
+
+# Root and health payloads never change while the process runs (REPL_ID
+# is fixed at start), so both responses are serialized once and reused
+ROOT_RESPONSE = Response(
+    content=orjson.dumps({
         "status": "healthy",
         "server": "UTJFC Registration MCP Server",
         "version": "1.0.0",
@@ -220,34 +742,41 @@ async def root():
             "mcp": "/mcp",
             "health": "/health"
         }
-    })
-
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return JSONResponse({
+    }),
+    media_type="application/json"
+)
+HEALTH_RESPONSE = Response(
+    content=orjson.dumps({
         "status": "healthy",
         "server": "UTJFC Registration MCP Server",
         "version": "1.0.0",
         "transport": "Streamable HTTP",
         "protocol": "MCP 2025-03-26",
         "environment": "production" if os.getenv("REPL_ID") else "development"
-    })
+    }),
+    media_type="application/json"
+)
+
+@app.get("/")
+async def root():
+    """Root endpoint - health check"""
+    return ROOT_RESPONSE
 
-@app.get("/mcp")
+@app.get("/health")
+async def health_check():
+    """Health check endpoint"""
+    return HEALTH_RESPONSE
+
+@app.get("/mcp", dependencies=[Depends(require_auth)])
 async def mcp_get_endpoint(request: Request):
     """Handle GET requests to MCP endpoint (SSE stream)"""
-    # Check authentication
-    if not check_auth(request):
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     accept_header = request.headers.get("accept", "")
     
     if "text/event-stream" in accept_header:
         # Create new SSE connection
         connection_id = str(uuid.uuid4())
         active_connections[connection_id] = {
-            "pending_messages": [],
+            "queue": asyncio.Queue(),
             "created_at": asyncio.get_event_loop().time()
         }
         
@@ -265,35 +794,29 @@ async def mcp_get_endpoint(request: Request):
         # Return 405 for non-SSE GET requests
         return Response(status_code=405)
 
-@app.post("/mcp")
+@app.post("/mcp", dependencies=[Depends(require_auth)])
 async def mcp_post_endpoint(request: Request):
     """Handle POST requests to MCP endpoint"""
-    # Check authentication
-    if not check_auth(request):
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
     try:
         # Check content type
         content_type = request.headers.get("content-type", "")
         if "application/json" not in content_type:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "Content-Type must be application/json"},
                 status_code=400
             )
         
         # Parse request body
-        body = await request.json()
+        body = orjson.loads(await request.body())
         
-        # Log request for debugging (remove in production)
-        logger.info(f"MCP Request: {json.dumps(body, indent=2)}")
+        # Log request for debugging; formatted only when DEBUG is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("MCP Request: %s", body)
         
         # Handle single request or batch
         if isinstance(body, list):
-            # Batch request
-            responses = []
-            for req in body:
-                resp = await handle_jsonrpc_request(req)
-                responses.append(resp)
+            # Batch request - the calls are independent, so run them concurrently
+            responses = await asyncio.gather(*(handle_jsonrpc_request(req) for req in body))
             
             # Check if we should return SSE
             accept_header = request.headers.get("accept", "")
@@ -301,7 +824,7 @@ async def mcp_post_endpoint(request: Request):
                 # Return SSE stream
                 async def sse_response():
                     for resp in responses:
-                        yield f"data: {json.dumps(resp)}\n\n"
+                        yield sse_frame(resp)
                 
                 return StreamingResponse(
                     sse_response(),
@@ -313,9 +836,13 @@ async def mcp_post_endpoint(request: Request):
                 )
             else:
                 # Return JSON array
-                return JSONResponse(responses)
+                return ORJSONResponse(responses)
         else:
             # Single request
+            if body.get("method") == "ping" and body.get("id") is not None:
+                # Liveness checks skip dispatch (and session routing) entirely
+                return Response(content=ping_body(body["id"]), media_type="application/json")
+            
             response = await handle_jsonrpc_request(body)
             
             # Check if this is just a notification/response (no result expected)
@@ -327,7 +854,7 @@ async def mcp_post_endpoint(request: Request):
             if "text/event-stream" in accept_header and response.get("result"):
                 # Return SSE stream
                 async def sse_response():
-                    yield f"data: {json.dumps(response)}\n\n"
+                    yield sse_frame(response)
                 
                 return StreamingResponse(
                     sse_response(),
@@ -339,10 +866,11 @@ async def mcp_post_endpoint(request: Request):
                 )
             else:
                 # Return JSON response
-                return JSONResponse(response)
+                is_tools_list = body.get("method") == "tools/list"
+                return ORJSONResponse(response, headers=TOOLS_CACHE_HEADERS if is_tools_list else None)
     
-    except json.JSONDecodeError:
-        return JSONResponse(
+    except orjson.JSONDecodeError:
+        return ORJSONResponse(
             {
                 "jsonrpc": "2.0",
                 "error": {
@@ -354,7 +882,7 @@ async def mcp_post_endpoint(request: Request):
         )
     except Exception as e:
         logger.error(f"Error handling POST request: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "jsonrpc": "2.0",
                 "error": {
@@ -385,7 +913,7 @@ if __name__ == "__main__":
     host = "0.0.0.0"  # Always use 0.0.0.0 for Replit
     
     print(f"🚀 Starting UTJFC Registration MCP Server")
-    print(f"🛠️  Tools available: airtable_database_operation")
+    print(f"🛠️  Tools available: {', '.join(tool['name'] for tool in TOOLS)}")
     print(f"🌐 Streamable HTTP Transport (OpenAI Compatible)")
     print(f"📋 Protocol: MCP 2025-03-26")
     
@@ -393,25 +921,32 @@ if __name__ == "__main__":
     if os.getenv("REPL_ID"):
         print(f"🔧 Running on Replit")
     
-    # Verify required environment variables
-    required_vars = ["OPENAI_API_KEY", "AIRTABLE_API_KEY"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
-    
-    if missing_vars:
-        print(f"⚠️  Missing environment variables: {missing_vars}")
-        print(f"📝 Please set them in Replit Secrets")
-    else:
-        print(f"✅ Environment variables configured")
-    
-    # Check authentication
-    if MCP_AUTH_TOKEN:
-        print(f"🔐 Authentication enabled")
-    else:
-        print(f"⚠️  No authentication configured (set MCP_AUTH_TOKEN for security)")
+    # Environment and authentication checks run in the startup event, so
+    # they also happen under gunicorn (see Procfile)
     
     print(f"📍 Starting server on http://{host}:{port}")
     print(f"🔗 MCP endpoint: /mcp")
     print(f"❤️  Health check: /health")
     
+    # uvloop + httptools come with uvicorn[standard]; fall back to asyncio/h11
+    # where uvloop isn't available (e.g. Windows)
+    try:
+        import uvloop
+        uvloop.install()
+        loop_impl, http_impl = "uvloop", "httptools"
+    except ImportError:
+        loop_impl, http_impl = "asyncio", "auto"
+    
     # Run the FastAPI server with explicit app reference
-    uvicorn.run("server:app", host=host, port=port, log_level="info", reload=False) 
\ No newline at end of file
+    uvicorn.run(
+        "server:app",
+        host=host,
+        port=port,
+        log_level="info",
+        reload=False,
+        loop=loop_impl,
+        http=http_impl,
+        # SSE connections, background jobs and the query caches live in
+        # process memory, so only raise this behind sticky sessions
+        workers=int(os.getenv("WEB_CONCURRENCY", 1))
+    ) 
\ No newline at end of file
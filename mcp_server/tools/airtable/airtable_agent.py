@@ -5,11 +5,11 @@ from openai import OpenAI
 from dotenv import load_dotenv
 import json
 import ast
-from .airtable_setup import get_table, get_table_config, format_airtable_error, format_success_response, AIRTABLE_BASE_ID, AIRTABLE_API_KEY
+from .airtable_setup import get_table, get_table_config, format_airtable_error, format_success_response, get_http_client, AIRTABLE_BASE_ID, AIRTABLE_API_KEY
 from .table_schema.registrations_2526 import REGISTRATIONS_2526_SCHEMA
 
 load_dotenv()
-client = OpenAI()
+client = OpenAI(http_client=get_http_client())
 
 class AirtableAgent:
     def __init__(self):
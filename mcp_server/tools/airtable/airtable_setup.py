@@ -2,7 +2,10 @@
 # Shared Airtable configuration, client setup, and helper functions
 
 from pyairtable import Api
+import atexit
 import os
+import threading
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -25,11 +28,37 @@ TABLES_CONFIG = {
     }
 }
 
+# Process-wide clients, created on first use so every request reuses warm connections
+_http_client = None
+_airtable_api = None
+_client_lock = threading.Lock()
+
+def get_http_client() -> httpx.Client:
+    """Return the shared pooled httpx client used for OpenAI calls"""
+    global _http_client
+    with _client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_keepalive_connections=50,
+                    max_connections=200,
+                    keepalive_expiry=30.0
+                ),
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                http2=True
+            )
+            atexit.register(_http_client.close)
+        return _http_client
+
 def get_airtable_client():
-    """Initialize and return Airtable API client"""
+    """Return the shared Airtable API client (one requests.Session for all calls)"""
+    global _airtable_api
     if not AIRTABLE_API_KEY:
         raise ValueError("AIRTABLE_API_KEY environment variable is required")
-    return Api(AIRTABLE_API_KEY)
+    with _client_lock:
+        if _airtable_api is None:
+            _airtable_api = Api(AIRTABLE_API_KEY)
+        return _airtable_api
 
 def get_table(season: str):
     """Get the specific table instance for a given season"""
@@ -14,8 +14,8 @@ def test_child_address_handling():
     
     # Check all relevant routines exist
     routines_to_check = [16, 17, 18]
-    for routine_num in routines_to_check:
-        routine = RegistrationRoutines.get_routine_message(routine_num)
+    routines = RegistrationRoutines.get_routine_messages(routines_to_check)
+    for routine_num, routine in routines.items():
         if routine:
             print(f"✅ Routine {routine_num} found: {routine[:60]}...")
         else:
@@ -70,29 +70,29 @@ def test_child_address_handling():
     print("-" * 30)
     
     response_examples = {
-        "YES responses": [
+        "Yes": [
             "yes", "yeah", "same address", "lives with me",
             "he's here", "that's right", "correct"
         ],
-        "NO responses": [
+        "No": [
             "no", "nope", "different address", "lives elsewhere", 
             "he's with his mum", "separate address"
         ],
-        "UNCLEAR responses": [
+        "Unclear": [
             "sometimes", "it depends", "well...", "mostly but...",
             "part of the time", "it's complicated"
         ]
     }
     
+    outcomes = {
+        "Yes": "→ 'Yes' → Routine 17",
+        "No": "→ 'No' → Routine 18",
+        "Unclear": "→ Stay on Routine 16"
+    }
     for category, examples in response_examples.items():
-        print(f"\n{category}:")
+        print(f"\n{category.upper()} responses:")
+        result = outcomes[category]
         for example in examples:
-            if category == "YES responses":
-                result = "→ 'Yes' → Routine 17"
-            elif category == "NO responses":
-                result = "→ 'No' → Routine 18"
-            else:
-                result = "→ Stay on Routine 16"
             print(f"  '{example}' {result}")
     
     print(f"\n🔄 Routine 18: Child's Separate Address")
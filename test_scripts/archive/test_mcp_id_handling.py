@@ -2,81 +2,84 @@
 """Test MCP server ID handling"""
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 MCP_URL = "https://utjfc-mcp-server.replit.app/mcp"
 
-def test_id_handling():
-    """Test that server correctly echoes request IDs"""
-    
-    print("🧪 Testing MCP Server ID Handling\n")
-    
-    # Test 1: Initialize with specific ID
-    print("1️⃣ Testing initialize with ID 42:")
-    response = requests.post(MCP_URL, json={
-        "jsonrpc": "2.0",
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2025-03-26",
-            "capabilities": {}
-        },
-        "id": 42
-    })
-    
+# One keep-alive session so every request reuses the same TLS connection
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+SESSION.headers.update({"Content-Type": "application/json"})
+
+def check_id(label, response, expected_id):
+    """Print whether a single response echoed the expected ID"""
+    print(label)
     if response.status_code == 200:
         data = response.json()
-        print(f"   Response ID: {data.get('id')} (expected: 42)")
-        print(f"   Match: {'✅' if data.get('id') == 42 else '❌'}")
+        print(f"   Response ID: {data.get('id')} (expected: {expected_id!r})")
+        print(f"   Match: {'✅' if data.get('id') == expected_id else '❌'}")
     else:
         print(f"   ❌ Error: {response.status_code}")
+
+def test_id_handling():
+    """Test that server correctly echoes request IDs"""
     
-    # Test 2: Tools/list with string ID
-    print("\n2️⃣ Testing tools/list with string ID 'test-123':")
-    response = requests.post(MCP_URL, json={
-        "jsonrpc": "2.0",
-        "method": "tools/list",
-        "params": {},
-        "id": "test-123"
-    })
-    
-    if response.status_code == 200:
-        data = response.json()
-        print(f"   Response ID: {data.get('id')} (expected: 'test-123')")
-        print(f"   Match: {'✅' if data.get('id') == 'test-123' else '❌'}")
-    else:
-        print(f"   ❌ Error: {response.status_code}")
+    print("🧪 Testing MCP Server ID Handling\n")
     
-    # Test 3: Tool call with numeric ID
-    print("\n3️⃣ Testing tool call with ID 999:")
-    response = requests.post(MCP_URL, json={
-        "jsonrpc": "2.0",
-        "method": "tools/call",
-        "params": {
-            "name": "airtable_database_operation",
-            "arguments": {
-                "season": "2526",
-                "query": "List all players"
-            }
+    payloads = [
+        # Test 1: Initialize with specific ID
+        {
+            "jsonrpc": "2.0",
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2025-03-26",
+                "capabilities": {}
+            },
+            "id": 42
+        },
+        # Test 2: Tools/list with string ID
+        {
+            "jsonrpc": "2.0",
+            "method": "tools/list",
+            "params": {},
+            "id": "test-123"
+        },
+        # Test 3: Tool call with numeric ID
+        {
+            "jsonrpc": "2.0",
+            "method": "tools/call",
+            "params": {
+                "name": "airtable_database_operation",
+                "arguments": {
+                    "season": "2526",
+                    "query": "List all players"
+                }
+            },
+            "id": 999
         },
-        "id": 999
-    })
+        # Test 4: Batch request with different IDs. Only the ID echo is under
+        # test (Test 2 already covers tools/list), so use cheap pings
+        [
+            {"jsonrpc": "2.0", "method": "ping", "id": 1},
+            {"jsonrpc": "2.0", "method": "ping", "id": 2},
+            {"jsonrpc": "2.0", "method": "ping", "id": 3}
+        ]
+    ]
     
-    if response.status_code == 200:
-        data = response.json()
-        print(f"   Response ID: {data.get('id')} (expected: 999)")
-        print(f"   Match: {'✅' if data.get('id') == 999 else '❌'}")
-    else:
-        print(f"   ❌ Error: {response.status_code}")
+    # The requests are independent, so send them all at once and report in order
+    with ThreadPoolExecutor(max_workers=len(payloads)) as pool:
+        init_response, list_response, call_response, batch_response = pool.map(
+            lambda payload: SESSION.post(MCP_URL, json=payload), payloads
+        )
     
-    # Test 4: Batch request with different IDs
-    print("\n4️⃣ Testing batch request with multiple IDs:")
-    batch_response = requests.post(MCP_URL, json=[
-        {"jsonrpc": "2.0", "method": "tools/list", "id": 1},
-        {"jsonrpc": "2.0", "method": "tools/list", "id": 2},
-        {"jsonrpc": "2.0", "method": "tools/list", "id": 3}
-    ])
+    check_id("1️⃣ Testing initialize with ID 42:", init_response, 42)
+    check_id("\n2️⃣ Testing tools/list with string ID 'test-123':", list_response, "test-123")
+    check_id("\n3️⃣ Testing tool call with ID 999:", call_response, 999)
     
+    print("\n4️⃣ Testing batch request with multiple IDs:")
     if batch_response.status_code == 200:
         responses = batch_response.json()
         for i, resp in enumerate(responses):
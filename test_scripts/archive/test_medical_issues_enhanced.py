@@ -4,11 +4,16 @@ Test script for enhanced medical issues collection (routine 5)
 Demonstrates how the agent should handle serious medical conditions requiring follow-up questions
 """
 
+import sys
+
 def test_medical_scenarios():
     """Test different medical condition scenarios and expected follow-up questions"""
     
-    print("🏥 Testing Enhanced Medical Issues Collection")
-    print("=" * 60)
+    # The whole report is built up front and written once
+    lines = [
+        "🏥 Testing Enhanced Medical Issues Collection",
+        "=" * 60,
+    ]
     
     # Test scenarios that should trigger detailed follow-up questions
     serious_conditions = [
@@ -54,41 +59,37 @@ def test_medical_scenarios():
         "Hay fever in summer"
     ]
     
-    print("\n🚨 Serious Conditions (REQUIRE detailed follow-up):")
-    print("-" * 50)
-    
+    lines += ["\n🚨 Serious Conditions (REQUIRE detailed follow-up):", "-" * 50]
     for scenario in serious_conditions:
-        print(f"\n📋 Parent says: '{scenario['condition']}'")
-        print("   ↳ Agent should ask:")
-        for question in scenario['expected_followups']:
-            print(f"     • {question}")
+        lines.append(f"\n📋 Parent says: '{scenario['condition']}'")
+        lines.append("   ↳ Agent should ask:")
+        lines += [f"     • {question}" for question in scenario['expected_followups']]
     
-    print(f"\n✅ Minor Conditions (basic documentation only):")
-    print("-" * 50)
+    lines += ["\n✅ Minor Conditions (basic documentation only):", "-" * 50]
+    lines += [f"📋 '{condition}' → Document as-is, no additional questions needed" for condition in minor_conditions]
     
-    for condition in minor_conditions:
-        print(f"📋 '{condition}' → Document as-is, no additional questions needed")
-    
-    print(f"\n🎯 Agent Behavior Guidelines:")
-    print("-" * 30)
-    print("• Detect serious medical conditions automatically")
-    print("• Ask specific follow-up questions for emergency planning")
-    print("• Capture location of medication/equipment")
-    print("• Document emergency procedures")
-    print("• Note specific triggers or things to avoid")
-    print("• Ensure club staff have actionable emergency information")
-    
-    print(f"\n📝 Example Enhanced Medical Record:")
-    print("-" * 40)
-    print("Medical Issues: Severe nut allergy")
-    print("Emergency Details:")
-    print("  - EpiPen location: In sports bag side pocket")
-    print("  - Emergency action: Call 999, administer EpiPen if needed")
-    print("  - Triggers to avoid: All nuts, especially peanuts")
-    print("  - Parent emergency contact: Already collected in routine 8")
+    lines += [
+        "\n🎯 Agent Behavior Guidelines:",
+        "-" * 30,
+        "• Detect serious medical conditions automatically",
+        "• Ask specific follow-up questions for emergency planning",
+        "• Capture location of medication/equipment",
+        "• Document emergency procedures",
+        "• Note specific triggers or things to avoid",
+        "• Ensure club staff have actionable emergency information",
+        "\n📝 Example Enhanced Medical Record:",
+        "-" * 40,
+        "Medical Issues: Severe nut allergy",
+        "Emergency Details:",
+        "  - EpiPen location: In sports bag side pocket",
+        "  - Emergency action: Call 999, administer EpiPen if needed",
+        "  - Triggers to avoid: All nuts, especially peanuts",
+        "  - Parent emergency contact: Already collected in routine 8",
+        "\n✅ Enhanced medical issues collection ready!",
+        "Routine 5 now captures life-saving emergency information!",
+    ]
     
-    print(f"\n✅ Enhanced medical issues collection ready!")
-    print("Routine 5 now captures life-saving emergency information!")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     test_medical_scenarios() 
\ No newline at end of file
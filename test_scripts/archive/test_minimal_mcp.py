@@ -4,7 +4,8 @@ Minimal test of OpenAI Responses API with MCP - Testing the ID fix
 """
 
 import os
-from openai import OpenAI
+import asyncio
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 import time
 
@@ -13,71 +14,65 @@ os.environ['OPENAI_LOG'] = 'debug'
 
 load_dotenv()
 
-client = OpenAI()
+client = AsyncOpenAI()
 
-def test_minimal_mcp():
-    print("🧪 Testing MCP After ID Fix")
-    print("=" * 50)
-    
-    # Test 1: Simple test_connection tool
-    print("\n1️⃣ Testing test_connection tool:")
+# One MCP tool spec shared by both calls, so they present an identical tool
+# definition and MCP tool listing
+TOOLS = [{
+    "type": "mcp",
+    "server_label": "utjfc_registration",
+    "server_url": "https://utjfc-mcp-server.replit.app/mcp",
+    "require_approval": "never",
+    "allowed_tools": ["test_connection", "airtable_database_operation"]
+}]
+
+async def run_tool_test(input_text):
+    """Run one Responses API call with the MCP tool; return (elapsed, response or exception)"""
     start_time = time.time()
-    
     try:
-        response = client.responses.create(
+        response = await client.responses.create(
             model="gpt-4.1",
-            input="Use the test_connection tool with message 'ID fix test'",
-            tools=[{
-                "type": "mcp",
-                "server_label": "utjfc_registration",
-                "server_url": "https://utjfc-mcp-server.replit.app/mcp",
-                "require_approval": "never",
-                "allowed_tools": ["test_connection"]
-            }]
+            input=input_text,
+            tools=TOOLS
         )
-        
-        elapsed = time.time() - start_time
-        print(f"   ✅ Response received in {elapsed:.2f}s!")
-        
-        if hasattr(response, 'output_text') and response.output_text:
-            print(f"   Output: {response.output_text[:200]}...")
-        else:
-            print(f"   Response: {response}")
-            
     except Exception as e:
-        elapsed = time.time() - start_time
-        print(f"   ❌ Error after {elapsed:.2f}s: {type(e).__name__}: {e}")
-    
-    # Test 2: Airtable tool
-    print("\n2️⃣ Testing airtable_database_operation tool:")
-    start_time = time.time()
+        return time.time() - start_time, e
+    return time.time() - start_time, response
+
+def report(label, elapsed, outcome, preview_chars=None):
+    print(label)
+    if isinstance(outcome, Exception):
+        print(f"   ❌ Error after {elapsed:.2f}s: {type(outcome).__name__}: {outcome}")
+        return
     
-    try:
-        response = client.responses.create(
-            model="gpt-4.1",
-            input="How many players are registered for season 2526?",
-            tools=[{
-                "type": "mcp",
-                "server_label": "utjfc_registration",
-                "server_url": "https://utjfc-mcp-server.replit.app/mcp",
-                "require_approval": "never",
-                "allowed_tools": ["airtable_database_operation"]
-            }]
-        )
-        
-        elapsed = time.time() - start_time
-        print(f"   ✅ Response received in {elapsed:.2f}s!")
-        
-        if hasattr(response, 'output_text') and response.output_text:
-            print(f"   Output: {response.output_text}")
+    print(f"   ✅ Response received in {elapsed:.2f}s!")
+    if hasattr(outcome, 'output_text') and outcome.output_text:
+        if preview_chars:
+            print(f"   Output: {outcome.output_text[:preview_chars]}...")
         else:
-            print(f"   Response: {response}")
-            
-    except Exception as e:
-        elapsed = time.time() - start_time
-        print(f"   ❌ Error after {elapsed:.2f}s: {type(e).__name__}: {e}")
+            print(f"   Output: {outcome.output_text}")
+    else:
+        print(f"   Response: {outcome}")
+
+async def run_minimal_mcp():
+    print("🧪 Testing MCP After ID Fix")
+    print("=" * 50)
+    
+    # The two calls are independent; run them together and report in order
+    (connection_elapsed, connection_outcome), (airtable_elapsed, airtable_outcome) = await asyncio.gather(
+        # Test 1: Simple test_connection tool
+        run_tool_test("Use the test_connection tool with message 'ID fix test'"),
+        # Test 2: Airtable tool
+        run_tool_test("How many players are registered for season 2526?")
+    )
+    
+    report("\n1️⃣ Testing test_connection tool:", connection_elapsed, connection_outcome, preview_chars=200)
+    report("\n2️⃣ Testing airtable_database_operation tool:", airtable_elapsed, airtable_outcome)
     
     print("\n✨ Test complete!")
 
+def test_minimal_mcp():
+    asyncio.run(run_minimal_mcp())
+
 if __name__ == "__main__":
     test_minimal_mcp() 
\ No newline at end of file